@@ -0,0 +1,107 @@
+"""Fill a score database with many rows and time the leaderboard queries.
+
+    python benchmarks/db_benchmark.py --rows 10000000
+
+The database is created through TetrisDatabase, so it has the production
+schema, indexes and pragmas. Top-N and per-player queries are timed with the
+in-memory leaderboard bypassed; the script exits non-zero if the p99 of either
+is above --max-ms.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from game.database import TetrisDatabase
+
+
+def fill(db, rows, players, seed=0, chunk=100_000):
+    """Insert rows random scores spread over players names, chunk rows per transaction."""
+    rng = random.Random(seed)
+    grade = db.calculate_grade
+    inserted = 0
+    while inserted < rows:
+        count = min(chunk, rows - inserted)
+        batch = []
+        for _ in range(count):
+            score = int(rng.expovariate(1 / 3000))
+            level = min(20, 1 + score // 2000)
+            batch.append((f"player{rng.randrange(players)}", score, level, score // 100,
+                          grade(score, level), "2024-01-01 00:00:00"))
+        with db.conn:
+            db.conn.executemany('''
+            INSERT INTO scores (player_name, score, level, lines_cleared, grade, date_time)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ''', batch)
+        inserted += count
+        print(f"\r{inserted}/{rows} rows", end="", file=sys.stderr, flush=True)
+    print(file=sys.stderr)
+
+
+def time_queries(query, args_list, repeat=1):
+    """Time query(*args) for each args tuple; returns milliseconds per execution.
+
+    Each query is run repeat times and every run is recorded, so the
+    percentiles include the slow runs as well as the fast ones.
+    """
+    timings = []
+    for args in args_list:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            query(*args)
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(name, timings, max_ms):
+    timings = sorted(timings)
+    p50 = statistics.median(timings)
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    ok = p99 < max_ms
+    print(f"{name:<14} p50 {p50:.3f} ms  p99 {p99:.3f} ms  max {timings[-1]:.3f} ms  {'ok' if ok else 'TOO SLOW'}")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark leaderboard queries on a large score table.")
+    parser.add_argument("--rows", type=int, default=10_000_000, help="rows to insert (default: 10M)")
+    parser.add_argument("--players", type=int, default=10_000, help="distinct player names")
+    parser.add_argument("--queries", type=int, default=1000, help="queries to time per kind")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per query; every run is timed")
+    parser.add_argument("--max-ms", type=float, default=1.0, help="p99 budget per query in milliseconds")
+    parser.add_argument("--path", help="database file to fill and keep (default: a temporary file)")
+    args = parser.parse_args(argv)
+
+    workdir = None if args.path else tempfile.TemporaryDirectory()
+    path = args.path or os.path.join(workdir.name, "scores.db")
+    db = TetrisDatabase(path)
+    try:
+        existing = db.cursor.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+        if existing < args.rows:
+            start = time.perf_counter()
+            fill(db, args.rows - existing, args.players)
+            print(f"Inserted {args.rows - existing} rows in {time.perf_counter() - start:.1f}s")
+
+        rng = random.Random(1)
+        limits = [(rng.choice((5, 10)),) for _ in range(args.queries)]
+        players = [(f"player{rng.randrange(args.players)}", 10) for _ in range(args.queries)]
+        # Warm the page cache once, as a running game would have
+        time_queries(db._query_high_scores, limits[:10])
+        time_queries(db.get_player_scores, players[:10])
+
+        ok = report("top-N", time_queries(db._query_high_scores, limits, args.repeat), args.max_ms)
+        ok &= report("per-player", time_queries(db.get_player_scores, players, args.repeat), args.max_ms)
+    finally:
+        db.close()
+        if workdir is not None:
+            workdir.cleanup()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""Measure cold-start time: module import times and tetris.py's time to first frame.
+
+    python benchmarks/startup.py --runs 5 --max-ms 1000
+
+Every measurement runs in a fresh interpreter. Import times are taken inside
+the child around the import statement; frame times are from launching the
+child to its first display flip (the loading splash) and to the first menu
+frame. tetris.py runs in a temporary directory, so it starts with a new
+score database, and with SDL's dummy video and audio drivers unless
+SDL_VIDEODRIVER / SDL_AUDIODRIVER are set. The logic modules must import
+without loading pygame. The script exits non-zero if one of them does, or if
+the median time to the first frame is above --max-ms.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+# Modules that must not pull in pygame, and the front end that does
+LOGIC_MODULES = ("game.components.block", "game.components.board", "game.engine", "game.ai", "replay")
+MODULES = LOGIC_MODULES + ("game.game",)
+
+IMPORT_PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start, 'pygame' in sys.modules)
+"""
+
+# Prints the wall-clock time of the first two flips (splash, then menu) and exits
+FRAME_PROBE = """
+import os, runpy, sys, time
+import pygame
+flips = []
+real_flip = pygame.display.flip
+def flip():
+    real_flip()
+    flips.append(time.time())
+    if len(flips) == 2:
+        print(*flips, flush=True)
+        os._exit(0)
+pygame.display.flip = flip
+sys.argv = [{script!r}]
+runpy.run_path({script!r}, run_name="__main__")
+"""
+
+
+def child_env():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    env["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    return env
+
+
+def import_time(module):
+    """Return (seconds, loaded_pygame) for importing module in a new interpreter."""
+    out = subprocess.run([sys.executable, "-c", IMPORT_PROBE.format(module=module)], cwd=ROOT,
+                         env=child_env(), capture_output=True, text=True, check=True).stdout.split()
+    return float(out[-2]), out[-1] == "True"
+
+
+def frame_times():
+    """Return (seconds to the first frame, seconds to the menu) from launching tetris.py."""
+    script = os.path.join(ROOT, "tetris.py")
+    with tempfile.TemporaryDirectory() as workdir:
+        launched = time.time()
+        out = subprocess.run([sys.executable, "-c", FRAME_PROBE.format(script=script)], cwd=workdir,
+                             env=child_env(), capture_output=True, text=True, check=True).stdout.split()
+    first, menu = float(out[-2]), float(out[-1])
+    return first - launched, menu - launched
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure import times and time to first frame.")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per measurement")
+    parser.add_argument("--max-ms", type=float, default=1000.0,
+                        help="budget for the median time to first frame in milliseconds")
+    parser.add_argument("--output", help="write the medians (ms) to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    ok = True
+    for module in MODULES:
+        runs = [import_time(module) for _ in range(args.runs)]
+        results[f"import {module}"] = statistics.median(seconds for seconds, _ in runs) * 1000
+        if module in LOGIC_MODULES and any(loaded for _, loaded in runs):
+            print(f"FAIL: importing {module} loads pygame")
+            ok = False
+
+    frames = [frame_times() for _ in range(args.runs)]
+    results["first frame"] = statistics.median(first for first, _ in frames) * 1000
+    results["menu frame"] = statistics.median(menu for _, menu in frames) * 1000
+
+    for name, ms in results.items():
+        print(f"{name:<36} {ms:9.1f} ms")
+    if results["first frame"] > args.max_ms:
+        print(f"FAIL: first frame after {results['first frame']:.0f} ms (budget {args.max_ms:.0f} ms)")
+        ok = False
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,310 @@
+"""Benchmark the engine, renderer and database against a stored baseline.
+
+    python benchmarks/suite.py                      # run, compare with baseline.json
+    python benchmarks/suite.py --update-baseline    # run and store the results as the baseline
+    python benchmarks/suite.py --quick --only board # fewer repeats, board benchmarks only
+
+Boards are fixtures with seeded random cells filled to several heights, and
+every benchmark uses fixed seeds, so runs differ only by timing noise. Each
+result is the fastest of several runs, in microseconds per operation. The
+results are written as JSON (--output) and compared with the baseline; any
+benchmark more than --tolerance slower than its baseline is reported as a
+regression and the script exits non-zero. Baselines are specific to the
+machine they were recorded on, so record one on the hardware you compare on.
+A few benchmarks also have a hard budget (BUDGETS) that fails the run
+whatever the baseline says, such as the AI's 1 ms per two-ply decision.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import pygame
+
+from db_benchmark import fill
+from game.ai import AIPlayer
+from game.components.block import Block
+from game.components.board import Board
+from game.database import TetrisDatabase
+from game.game import Game
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+FILL_LEVELS = (0, 25, 50, 75)  # Percent of the board height holding settled cells
+DB_SIZES = (1_000, 100_000, 1_000_000)
+
+# Hard limits in microseconds per operation, keyed by benchmark name without the [...] part
+BUDGETS = {
+    "ai.best_placement_lookahead": 1000.0,
+}
+
+
+def measure(fn, repeat=5, min_time=0.02):
+    """Return the fastest of repeat runs of fn, in microseconds per call.
+
+    Each run calls fn enough times to take at least min_time seconds.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed * 2 >= min_time else 10
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best / number * 1e6
+
+
+def board_fixture(percent, seed=0):
+    """A board whose bottom percent of rows are 70% filled with random cells (none full)."""
+    rng = random.Random(seed)
+    board = Board()
+    for y in range(Board.HEIGHT - Board.HEIGHT * percent // 100, Board.HEIGHT):
+        xs = [x for x in range(Board.WIDTH) if rng.random() < 0.7]
+        if len(xs) == Board.WIDTH:
+            xs.pop(rng.randrange(len(xs)))
+        for x in xs:
+            board.set_cell(x, y, Block.COLORS[rng.randrange(7)])
+    return board
+
+
+def clear_fixture(percent, seed=0):
+    """A fixture with an empty right column and the bottom four rows full apart from it."""
+    board = board_fixture(percent, seed)
+    for y in range(Board.HEIGHT):
+        board.set_cell(Board.WIDTH - 1, y, None)
+    for y in range(Board.HEIGHT - 4, Board.HEIGHT):
+        for x in range(Board.WIDTH - 1):
+            board.set_cell(x, y, Block.COLORS[0])
+    return board
+
+
+def poses(board, count=64, seed=0):
+    """Seeded valid poses of random pieces above the settled cells."""
+    rng = random.Random(seed)
+    blocks = []
+    while len(blocks) < count:
+        block = Block.from_piece(rng.randrange(7), rng.randrange(4), 0, 0)
+        block.x = rng.randrange(Board.WIDTH - block.rotation_state.width + 1)
+        if board.is_valid_position(block):
+            blocks.append(block)
+    return blocks
+
+
+def cycle(items):
+    """A zero-argument function returning the items in turn, forever."""
+    state = [0]
+    size = len(items)
+
+    def next_item():
+        i = state[0]
+        state[0] = (i + 1) % size
+        return items[i]
+    return next_item
+
+
+def bench_board(run, quick):
+    for percent in FILL_LEVELS:
+        board = board_fixture(percent)
+        blocks = poses(board)
+        block = cycle(blocks)
+        run(f"board.is_valid_position[fill={percent}]", lambda: board.is_valid_position(block()))
+        run(f"board.drop_distance[fill={percent}]", lambda: board.drop_distance(block()))
+        # Alternating poses miss the ghost cache every call; the same pose hits it
+        run(f"board.get_ghost_position[fill={percent}]", lambda: board.get_ghost_position(block()))
+        run(f"board.get_ghost_position_cached[fill={percent}]", lambda: board.get_ghost_position(blocks[0]))
+
+        # Placing and clearing changes the board, so each call starts from a
+        # fresh copy of the fixture; board.load_cells is timed alone to compare
+        fixture = clear_fixture(percent)
+        cells, palette = bytes(fixture.cells), list(fixture.palette)
+        scratch = Board()
+        well = Block.from_piece(0, 1, Board.WIDTH - 1, 0)  # Vertical I over the well
+        well.x -= well.rotation_state.cells[0][0]
+        well.y = fixture.drop_distance(well)
+
+        def place_and_clear():
+            scratch.load_cells(cells, palette)
+            scratch.place_block(well)
+            scratch.clear_lines()
+            scratch.finish_clearing_animation()
+        run(f"board.load_cells[fill={percent}]", lambda: scratch.load_cells(cells, palette))
+        run(f"board.place_and_clear[fill={percent}]", place_and_clear)
+
+    spinner = Block.from_piece(1, 0, 4, 0)
+    run("block.rotate", spinner.rotate)
+
+
+def bench_ai(run, quick):
+    rng = random.Random(0)
+    pairs = [(piece, next_piece) for piece in range(7) for next_piece in range(7)]
+    rng.shuffle(pairs)
+    greedy, lookahead = AIPlayer(lookahead=False), AIPlayer()
+    for percent in FILL_LEVELS:
+        rows = list(board_fixture(percent).rows)
+        pair = cycle(pairs)
+        run(f"ai.best_placement[fill={percent}]", lambda: greedy.best_placement(rows, pair()[0]))
+        run(f"ai.best_placement_lookahead[fill={percent}]",
+            lambda: lookahead.best_placement(rows, *pair()))
+
+
+def bench_draw(run, quick):
+    surface = pygame.Surface((Board.WIDTH * Board.CELL_SIZE, Board.HEIGHT * Board.CELL_SIZE))
+    for percent in FILL_LEVELS:
+        board = board_fixture(percent)
+        block = poses(board, count=1)[0]
+        ghost = board.get_ghost_position(block)
+        run(f"board.draw[fill={percent}]", lambda: board.draw(surface, block, ghost))
+        keys = board.draw(surface, block, ghost)
+        moved = block.copy()
+        moved.y += 1
+        moved_ghost = board.get_ghost_position(moved).copy()
+        # One row of fall: the few cells the block left and entered are redrawn
+        run(f"board.draw_changed[fill={percent}]",
+            lambda: board.draw_changed(surface, keys, moved, moved_ghost))
+
+
+def bench_save_load(run, quick):
+    db = TetrisDatabase(":memory:")
+    try:
+        for percent in FILL_LEVELS:
+            game = Game(pygame.Surface((1, 1)), f"bench{percent}", db_instance=db)
+            game.autosaver = None
+            game.board.load_cells(board_fixture(percent).cells, game.board.palette)
+            run(f"game.save_state[fill={percent}]", game.save_state)
+            run(f"game.load_state[fill={percent}]", game.load_state)
+    finally:
+        db.close()
+
+
+def bench_db(run, quick):
+    sizes = DB_SIZES[:2] if quick else DB_SIZES
+    with tempfile.TemporaryDirectory() as workdir:
+        db = TetrisDatabase(os.path.join(workdir, "bench.db"))
+        try:
+            rows = 0
+            for size in sizes:
+                fill(db, size - rows, players=1000, seed=size)
+                rows = size
+                limit = cycle([5, 10])
+                db._query_high_scores(10)  # Warm the page cache
+                # The in-memory leaderboard is bypassed, so this is the indexed SQL query
+                run(f"db.top_n[rows={size}]", lambda: db._query_high_scores(limit()))
+        finally:
+            db.close()
+
+
+SUITES = {
+    "board": bench_board,
+    "ai": bench_ai,
+    "draw": bench_draw,
+    "save_load": bench_save_load,
+    "db": bench_db,
+}
+
+
+def run_suites(names, quick=False):
+    """Run the named suites; returns {benchmark: microseconds per operation}."""
+    results = {}
+    repeat = 3 if quick else 7
+
+    def run(name, fn):
+        results[name] = round(measure(fn, repeat=repeat), 4)
+        print(f"{name:<44} {results[name]:>12.3f} us", flush=True)
+
+    for name in names:
+        SUITES[name](run, quick)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Return (name, baseline_us, result_us) for every result more than tolerance slower than baseline."""
+    regressions = []
+    for name, us in results.items():
+        base = baseline.get(name)
+        if base is not None and us > base * (1 + tolerance):
+            regressions.append((name, base, us))
+    return regressions
+
+
+def over_budget(results):
+    """Return (name, budget_us, result_us) for every result above its hard budget."""
+    failures = []
+    for name, us in results.items():
+        budget = BUDGETS.get(name.split("[")[0])
+        if budget is not None and us > budget:
+            failures.append((name, budget, us))
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the engine, renderer and database.")
+    parser.add_argument("--only", action="append", choices=sorted(SUITES),
+                        help="run only this suite (repeatable; default: all)")
+    parser.add_argument("--quick", action="store_true", help="fewer repeats and no 1M-row database")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="store the results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.3,
+                        help="allowed slowdown before a result counts as a regression (default: 0.3 = 30%%)")
+    args = parser.parse_args(argv)
+
+    results = run_suites(args.only or list(SUITES), args.quick)
+    report = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.platform(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    failures = over_budget(results)
+    for name, budget, us in failures:
+        print(f"OVER BUDGET {name}: {us:.3f} us (budget {budget:.0f} us)")
+    status = 1 if failures else 0
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)["results"]
+        report["results"] = {**baseline, **results}
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return status
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to record one")
+        return status
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.tolerance)
+    for name, base, us in regressions:
+        print(f"REGRESSION {name}: {us:.3f} us vs {base:.3f} us baseline ({us / base - 1:+.0%})")
+    if regressions:
+        print(f"{len(regressions)} of {len(results)} benchmarks regressed by more than {args.tolerance:.0%}")
+        return 1
+    print(f"All {len(results)} benchmarks within {args.tolerance:.0%} of the baseline")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
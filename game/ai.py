@@ -0,0 +1,239 @@
+from collections import namedtuple
+
+import numpy as np
+
+from .components.block import Block
+from .components.board import Board
+from .vector_engine import PLACEMENT_MASKS, clear_full_rows
+
+# A final resting pose of a piece: rotation, column, row, and the resulting
+# board rows (after any line clears) together with the number of lines cleared.
+Placement = namedtuple('Placement', ['rotation', 'x', 'y', 'rows', 'lines'])
+
+# Weights for the evaluation features; higher scores are better.
+DEFAULT_WEIGHTS = {
+    'aggregate_height': -0.510066,
+    'lines': 0.760666,
+    'holes': -0.35663,
+    'bumpiness': -0.184483,
+    'wells': -0.1,
+}
+
+# Placement slots (rotation * WIDTH + x, as in vector_engine) worth trying per
+# piece: in bounds, and only one rotation out of any with identical shapes
+PIECE_SLOTS = tuple(
+    np.array([rotation * Board.WIDTH + x
+              for rotation in Block.UNIQUE_ROTATIONS[piece]
+              for x in range(Board.WIDTH - Block.ROTATIONS[piece][rotation].width + 1)])
+    for piece in range(len(Block.ROTATIONS))
+)
+
+_POPCOUNT = tuple(bin(mask).count('1') for mask in range(1 << Board.WIDTH))
+_BITS = tuple(tuple(x for x in range(Board.WIDTH) if mask >> x & 1) for mask in range(1 << Board.WIDTH))
+_PIECE_ROWS = np.arange(4)[:, None, None]  # Row offsets within a piece, for broadcasting
+
+
+def placements(rows, piece, start_y=0):
+    """List every distinct final placement of a piece dropped straight down from start_y.
+
+    rows is a sequence of Board.HEIGHT row bitmasks (e.g. Board.rows). Pieces
+    are dropped the way Game.drop_block drops them: from their current height
+    until the next row down would collide.
+    """
+    full_row = Board.FULL_ROW
+    result = []
+    for rotation in Block.UNIQUE_ROTATIONS[piece]:
+        state = Block.ROTATIONS[piece][rotation]
+        for x in range(Board.WIDTH - state.width + 1):
+            block = Block.from_piece(piece, rotation, x, start_y)
+            if not _fits(rows, block):
+                continue
+            while True:
+                block.y += 1
+                if not _fits(rows, block):
+                    block.y -= 1
+                    break
+            new_rows = list(rows)
+            for dy, mask in enumerate(state.row_masks):
+                if block.y + dy >= 0:
+                    new_rows[block.y + dy] |= mask << x
+            kept = [row for row in new_rows if row != full_row]
+            lines = len(new_rows) - len(kept)
+            result.append(Placement(rotation, x, block.y, [0] * lines + kept, lines))
+    return result
+
+
+def _fits(rows, block):
+    state = block.rotation_state
+    if block.y + state.height > Board.HEIGHT:
+        return False
+    for dy, mask in enumerate(state.row_masks):
+        if block.y + dy >= 0 and rows[block.y + dy] & (mask << block.x):
+            return False
+    return True
+
+
+def features(rows):
+    """Return (aggregate_height, holes, bumpiness, wells) for a sequence of row bitmasks.
+
+    Holes are empty cells below a column's top cell; a well's depth is how far
+    a column sits below its lower neighbour, with the walls counting as full.
+    """
+    heights = [0] * Board.WIDTH
+    holes = 0
+    seen = 0
+    for y, row in enumerate(rows):
+        if seen:
+            holes += _POPCOUNT[seen & ~row]
+        new = row & ~seen
+        if new:
+            for column in _BITS[new]:
+                heights[column] = Board.HEIGHT - y
+            seen |= row
+    walled = [Board.HEIGHT] + heights + [Board.HEIGHT]
+    bumpiness = sum(abs(heights[i] - heights[i + 1]) for i in range(Board.WIDTH - 1))
+    wells = sum(max(0, min(walled[i], walled[i + 2]) - walled[i + 1]) for i in range(Board.WIDTH))
+    return sum(heights), holes, bumpiness, wells
+
+
+def weighted_score(weights, lines, aggregate_height, holes, bumpiness, wells):
+    """The weighted sum of the features; works on plain numbers and NumPy arrays alike."""
+    return (weights['aggregate_height'] * aggregate_height
+            + weights['lines'] * lines
+            + weights['holes'] * holes
+            + weights['bumpiness'] * bumpiness
+            + weights['wells'] * wells)
+
+
+def evaluate(rows, lines, weights=DEFAULT_WEIGHTS):
+    """Score a board position with the weighted feature set; higher is better."""
+    return weighted_score(weights, lines, *features(rows))
+
+
+def expand(boards, piece, start_y=0):
+    """Drop a piece into every slot in PIECE_SLOTS[piece] on every board at once.
+
+    boards is a (HEIGHT, N) uint16 array of row masks. Returns (boards, y,
+    lines, legal) for N * len(PIECE_SLOTS[piece]) results, ordered board-major
+    then by slot.
+    """
+    height = Board.HEIGHT
+    count = boards.shape[1]
+    slots = PIECE_SLOTS[piece]
+    size = slots.size
+    masks = PLACEMENT_MASKS[:, piece * 4 * Board.WIDTH + slots, None]
+    padded = np.empty((height + 4, 1, count), dtype=np.uint16)
+    padded[:height, 0] = boards
+    padded[height:] = Board.FULL_ROW
+
+    # The first row at which the piece overlaps anything, minus one. The
+    # arrays are (row, slot, board) so the broadcasts run along the boards.
+    span = height + 1 - start_y
+    overlap = padded[start_y:start_y + span] & masks[0]
+    for r in range(1, 4):
+        overlap |= padded[start_y + r:start_y + r + span] & masks[r]
+    landing = start_y - 1 + (overlap != 0).argmax(axis=0).T
+    legal = landing >= start_y
+    landing = np.where(legal, landing, 0)
+
+    # OR all four piece rows in with one scatter. Rows of a piece that reach
+    # below the floor are empty and land in four spare rows, so no two
+    # targets share a cell (a fancy-indexed |= keeps only the last write).
+    total = count * size
+    placed = np.empty((height + 4, count, size), dtype=np.uint16)
+    placed[:height] = boards[:, :, None]
+    placed[height:] = 0
+    target = (landing + _PIECE_ROWS) * total + np.arange(total).reshape(count, size)
+    placed.reshape(-1)[target] |= masks[:, None, :, 0] * legal
+    placed = placed[:height].reshape(height, total)
+    lines = clear_full_rows(placed)
+    return placed, landing.ravel(), lines, legal.ravel()
+
+
+def batch_features(boards, cells):
+    """Vectorised features() for a (HEIGHT, N) array of row masks.
+
+    cells holds the number of filled cells on each board, which turns the
+    hole count into total height minus filled cells.
+    """
+    covered = np.array(boards, dtype='<u2', order='C')
+    for y in range(1, Board.HEIGHT):
+        np.bitwise_or(covered[y - 1], covered[y], out=covered[y])
+    bits = np.unpackbits(covered.view(np.uint8), axis=1, bitorder='little')
+    # Heights are (WIDTH, N) so the per-board sums run along the long axis
+    counts = np.add.reduce(bits, axis=0, dtype=np.uint8).reshape(-1, 16)
+    heights = counts.T[:Board.WIDTH].astype(np.int16)
+    aggregate_height = heights.sum(axis=0)
+    bumpiness = np.abs(heights[1:] - heights[:-1]).sum(axis=0)
+    # A column's well depth is measured against its lower neighbour; the walls count as full
+    lower = np.empty_like(heights)
+    np.minimum(heights[:-2], heights[2:], out=lower[1:-1])
+    lower[0] = heights[1]
+    lower[-1] = heights[-2]
+    wells = np.maximum(lower - heights, 0).sum(axis=0)
+    return aggregate_height, aggregate_height - cells, bumpiness, wells
+
+
+class AIPlayer:
+    """Placement-search bot with a weighted heuristic and next-piece lookahead.
+
+    Every placement of the current piece is scored; with lookahead each one is
+    scored by the best placement of the next piece on the resulting board.
+    beam limits that second ply to the best first-ply candidates (None
+    searches all of them).
+    """
+
+    def __init__(self, weights=None, lookahead=True, beam=None):
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.lookahead = lookahead
+        self.beam = beam
+
+    def score(self, boards, lines, cells):
+        """Heuristic score of each board in a (HEIGHT, N) array; evaluate() for many boards."""
+        return weighted_score(self.weights, lines, *batch_features(boards, cells))
+
+    def best_placement(self, rows, piece, next_piece=None, start_y=0):
+        """Return the best Placement for piece on rows, or None if it has no legal placement."""
+        cells = sum(_POPCOUNT[row] for row in rows)
+        boards, landing, lines, legal = expand(np.array(rows, dtype=np.uint16)[:, None], piece, start_y)
+        candidates = np.nonzero(legal)[0]
+        if not candidates.size:
+            return None
+        scores = self.score(boards[:, candidates], lines[candidates], cells + 4 - 10 * lines[candidates])
+
+        if next_piece is not None:
+            if self.beam is not None and candidates.size > self.beam:
+                keep = np.argsort(-scores, kind='stable')[:self.beam]
+                candidates, scores = candidates[keep], scores[keep]
+            follow_slots = PIECE_SLOTS[next_piece].size
+            follow_boards, _, follow_lines, follow_legal = expand(boards[:, candidates], next_piece)
+            total_lines = np.repeat(lines[candidates], follow_slots) + follow_lines
+            follow_scores = self.score(follow_boards, total_lines, cells + 8 - 10 * total_lines)
+            follow_scores[~follow_legal] = -np.inf
+            best_follow = follow_scores.reshape(candidates.size, follow_slots).max(axis=1)
+            # If the next piece cannot spawn anywhere, fall back to the first-ply score
+            if np.isfinite(best_follow).any():
+                scores = best_follow
+
+        best = candidates[int(np.argmax(scores))]
+        slot = PIECE_SLOTS[piece][best]
+        return Placement(int(slot // Board.WIDTH), int(slot % Board.WIDTH), int(landing[best]),
+                         boards[:, best].tolist(), int(lines[best]))
+
+    def choose(self, engine):
+        """Return the (rotation, x) to play for the engine's current block, or None."""
+        if engine.game_over or not engine.current_block:
+            return None
+        block = engine.current_block
+        next_piece = engine.next_block.piece if self.lookahead and engine.next_block else None
+        placement = self.best_placement(engine.board.rows, block.piece, next_piece, block.y)
+        if placement is None:
+            return None
+        return placement.rotation, placement.x
+
+    def play(self, engine):
+        """Choose and play one placement; returns lines cleared or None if no move was made."""
+        move = self.choose(engine)
+        if move is None:
+            return None
+        return engine.place(*move)
@@ -0,0 +1,72 @@
+from concurrent.futures import Future
+
+from . import savestate
+
+
+class Autosaver:
+    """Ring buffer of autosave slots for one player, written as keyframes and deltas.
+
+    Each save goes to slot sequence % slots. Every keyframe_interval-th save
+    is a full keyframe; the ones in between are savestate deltas holding only
+    the board rows that changed since that keyframe. Overwriting a keyframe
+    also deletes the deltas that depend on it, so every remaining slot can be
+    restored and the ring holds at least slots - keyframe_interval + 1 saves.
+    Writes go through the database's background writer.
+    """
+
+    def __init__(self, db, player_name, slots=8, keyframe_interval=4):
+        if not 1 <= keyframe_interval <= slots:
+            raise ValueError("keyframe_interval must be between 1 and slots")
+        self.db = db
+        self.player_name = player_name
+        self.slots = slots
+        self.keyframe_interval = keyframe_interval
+        # slot -> (sequence, keyframe sequence) of what is stored there
+        self.occupants = {slot: (sequence, keyframe)
+                          for slot, sequence, keyframe, _ in db.get_autosaves(player_name)
+                          if slot < slots}
+        self.sequence = max((sequence for sequence, _ in self.occupants.values()), default=-1) + 1
+        self._keyframe = None  # (sequence, cells, palette) the next delta is taken against
+
+    def save(self, engine):
+        """Autosave an engine's state; returns a Future resolving to True/False."""
+        sequence = self.sequence
+        self.sequence += 1
+        slot = sequence % self.slots
+        try:
+            if self._delta_allowed(engine, sequence):
+                keyframe = self._keyframe[0]
+                data = savestate.encode_delta(engine, self._keyframe[1])
+            else:
+                keyframe = sequence
+                data = savestate.encode(engine)
+                self._keyframe = (sequence, bytes(engine.board.cells), list(engine.board.palette))
+        except savestate.SaveStateError as e:
+            print(f"Error autosaving game state: {e}")
+            self._keyframe = None
+            future = Future()
+            future.set_result(False)
+            return future
+        clear = self._dependents(slot)
+        self.occupants[slot] = (sequence, keyframe)
+        return self.db.save_autosave_async(self.player_name, slot, sequence, keyframe, data, clear)
+
+    def _delta_allowed(self, engine, sequence):
+        if self._keyframe is None or sequence % self.keyframe_interval == 0:
+            return False
+        palette = engine.board.palette
+        base_palette = self._keyframe[2]
+        return len(palette) <= 16 and palette[:len(base_palette)] == base_palette
+
+    def _dependents(self, slot):
+        """Slots holding deltas of the keyframe about to be overwritten in slot."""
+        if slot not in self.occupants:
+            return []
+        sequence, keyframe = self.occupants[slot]
+        if sequence != keyframe:
+            return []
+        clear = [other for other, (_, base) in self.occupants.items()
+                 if base == sequence and other != slot]
+        for other in clear:
+            del self.occupants[other]
+        return clear
@@ -0,0 +1,114 @@
+import pygame
+
+GRID_COLOR = (50, 50, 50)
+GHOST_COLOR = (100, 100, 100)
+OUTLINE_COLOR = (255, 255, 255)
+
+
+class CellAtlas:
+    """Every cell sprite the playfield needs, rendered once into a single surface.
+
+    Row 0 holds the empty cell and the ghost outline. Each colour gets a row
+    with the settled cell, the falling-block cell (with and without the ghost
+    outline on top) and one sprite per step of the line-clear fade. Sprites
+    are returned as (surface, area) pairs ready for Surface.blit/blits.
+    Colours outside the initial set get their own row on first use.
+    """
+
+    def __init__(self, colors, cell_size, fade_steps):
+        self.cell_size = cell_size
+        self.fade_steps = fade_steps
+        self.columns = max(2, 3 + fade_steps)
+        self.surface = pygame.Surface((self.columns * cell_size, (1 + len(colors)) * cell_size))
+        self.rows = {}
+        self._draw_row(0, None)
+        for row, color in enumerate(colors, 1):
+            self._draw_row(row, tuple(color))
+        self._match_display()
+
+    def _match_display(self):
+        # Blits are fastest when the atlas shares the display's pixel format
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert()
+
+    def _area(self, row, column):
+        size = self.cell_size
+        return pygame.Rect(column * size, row * size, size, size)
+
+    def _draw_row(self, row, color):
+        surface = self.surface
+        size = self.cell_size
+        if color is None:
+            self._draw_empty(self._area(row, 0))
+            ghost = self._area(row, 1)
+            surface.fill((0, 0, 0), ghost)
+            pygame.draw.rect(surface, GHOST_COLOR, ghost, 1)
+            return
+
+        self.rows[color] = row
+        cell = self._area(row, 0)
+        self._draw_empty(cell)
+        surface.fill(color, cell.inflate(-2, -2))
+
+        for column, ghost in ((1, False), (2, True)):
+            block = self._area(row, column)
+            surface.fill(color, block)
+            pygame.draw.rect(surface, OUTLINE_COLOR, block, 1)
+            if ghost:
+                pygame.draw.rect(surface, GHOST_COLOR, block, 1)
+
+        fade = pygame.Surface((size - 2, size - 2), pygame.SRCALPHA)
+        for step in range(self.fade_steps):
+            area = self._area(row, 3 + step)
+            self._draw_empty(area)
+            alpha = int(255 * (1 - step / self.fade_steps))
+            fade.fill((*color, alpha))
+            surface.blit(fade, area.inflate(-2, -2))
+
+    def _draw_empty(self, area):
+        self.surface.fill((0, 0, 0), area)
+        pygame.draw.rect(self.surface, GRID_COLOR, area, 1)
+
+    def _row(self, color):
+        color = tuple(color)
+        row = self.rows.get(color)
+        if row is None:
+            # Grow the atlas by one row for a colour it has not seen yet
+            row = self.surface.get_height() // self.cell_size
+            grown = pygame.Surface((self.surface.get_width(), (row + 1) * self.cell_size))
+            grown.blit(self.surface, (0, 0))
+            self.surface = grown
+            self._draw_row(row, color)
+            self._match_display()
+        return row
+
+    def empty(self):
+        return self.surface, self._area(0, 0)
+
+    def ghost(self):
+        return self.surface, self._area(0, 1)
+
+    def cell(self, color):
+        row = self._row(color)
+        return self.surface, self._area(row, 0)
+
+    def block(self, color, ghost=False):
+        row = self._row(color)
+        return self.surface, self._area(row, 2 if ghost else 1)
+
+    def fade(self, color, step):
+        row = self._row(color)
+        step = min(max(step, 0), self.fade_steps - 1)
+        return self.surface, self._area(row, 3 + step)
+
+
+_shared = {}
+
+
+def shared_atlas(colors, cell_size, fade_steps):
+    """Return the process-wide atlas for these settings, building it on first use."""
+    key = (tuple(map(tuple, colors)), cell_size, fade_steps)
+    atlas = _shared.get(key)
+    if atlas is None:
+        atlas = _shared[key] = CellAtlas(colors, cell_size, fade_steps)
+    return atlas
@@ -1,7 +1,28 @@
-import pygame
 import random
+from collections import namedtuple
+
+# Precomputed data for one rotation of a piece: the shape matrix, the filled
+# (x, y) cell offsets, one bitmask per row (bit x = column x), the size and the
+# bottom profile (lowest filled y offset of each column).
+RotationState = namedtuple('RotationState', ['shape', 'cells', 'row_masks', 'width', 'height', 'bottoms'])
+
+
+def _build_rotations(shape):
+    """Return the four clockwise rotation states of a shape matrix."""
+    shape = tuple(tuple(row) for row in shape)
+    states = []
+    for _ in range(4):
+        cells = tuple((x, y) for y, row in enumerate(shape) for x, cell in enumerate(row) if cell)
+        row_masks = tuple(sum(1 << x for x, cell in enumerate(row) if cell) for row in shape)
+        bottoms = tuple(max(y for y, row in enumerate(shape) if row[x]) for x in range(len(shape[0])))
+        states.append(RotationState(shape, cells, row_masks, len(shape[0]), len(shape), bottoms))
+        shape = tuple(zip(*shape[::-1]))
+    return tuple(states)
+
 
 class Block:
+    __slots__ = ('piece', 'rotation', 'x', 'y')
+
     SHAPES = [
         [[1, 1, 1, 1]],  # I
         [[1, 1, 1], [0, 1, 0]],  # T
@@ -22,66 +43,105 @@ class Block:
         (255, 0, 0)     # Red (Z)
     ]
 
+    # ROTATIONS[piece][rotation] -> RotationState, built once at import time
+    ROTATIONS = tuple(_build_rotations(shape) for shape in SHAPES)
+
+    # Rotation indices with distinct shapes per piece (e.g. one for O, two for I/S/Z)
+    UNIQUE_ROTATIONS = tuple(
+        tuple(r for r in range(4) if states[r].shape not in [states[i].shape for i in range(r)])
+        for states in ROTATIONS
+    )
+
     def __init__(self, shape, color):
-        self.shape = shape
-        self.color = color
+        self.piece, self.rotation = _lookup_piece(shape, color)
         self.x = 3
         self.y = 0
 
+    @classmethod
+    def from_piece(cls, piece, rotation=0, x=3, y=0):
+        """Create a Block directly from a piece index without any shape lookup."""
+        block = cls.__new__(cls)
+        block.piece = piece
+        block.rotation = rotation
+        block.x = x
+        block.y = y
+        return block
+
+    def copy(self):
+        """Return a new Block with the same piece and pose."""
+        return Block.from_piece(self.piece, self.rotation, self.x, self.y)
+
+    @property
+    def rotation_state(self):
+        """The precomputed RotationState for the current rotation."""
+        return Block.ROTATIONS[self.piece][self.rotation]
+
+    @property
+    def shape(self):
+        return Block.ROTATIONS[self.piece][self.rotation].shape
+
+    @property
+    def color(self):
+        return Block.COLORS[self.piece]
+
     def to_dict(self):
         """Return a dictionary representation of the block."""
         return {
-            'shape': self.shape,
+            'shape': [list(row) for row in self.shape],
             'color': self.color,
             'x': self.x,
-            'y': self.y
+            'y': self.y,
+            'piece': self.piece,
+            'rotation': self.rotation
         }
 
     @classmethod
     def from_dict(cls, data):
         """Create a Block instance from a dictionary."""
-        # We assume shape and color are directly usable by __init__
-        # If SHAPES and COLORS were just indices, we'd need to look them up.
-        # For now, direct assignment is fine as per current __init__ structure.
-        block = cls(data['shape'], data['color'])
+        # Older saves only stored the shape matrix and colour, so fall back to
+        # looking the piece up from those.
+        if 'piece' in data:
+            block = cls.from_piece(data['piece'], data.get('rotation', 0))
+        else:
+            block = cls(data['shape'], data['color'])
         block.x = data['x']
         block.y = data['y']
         return block
 
     @classmethod
-    def random(cls):
-        shape_index = random.randint(0, len(cls.SHAPES) - 1)
-        return cls(cls.SHAPES[shape_index], cls.COLORS[shape_index])
+    def random(cls, rng=None):
+        """Create a random piece, drawing from rng (a random.Random) if given."""
+        return cls.from_piece((rng or random).randint(0, len(cls.SHAPES) - 1))
 
     def rotate(self, direction=1):
-        self.shape = list(zip(*self.shape[::-direction]))
+        self.rotation = (self.rotation + direction) % 4
 
     def move(self, dx, dy):
         self.x += dx
         self.y += dy
 
     def draw(self, screen, offset_x=0, offset_y=0):
-        for y, row in enumerate(self.shape):
-            for x, cell in enumerate(row):
-                if cell:
-                    pygame.draw.rect(
-                        screen,
-                        self.color,
-                        (
-                            (self.x + x) * 30 + offset_x,
-                            (self.y + y) * 30 + offset_y,
-                            30,
-                            30
-                        )
-                    )
-                    pygame.draw.rect(
-                        screen,
-                        (255, 255, 255),
-                        (
-                            (self.x + x) * 30 + offset_x,
-                            (self.y + y) * 30 + offset_y,
-                            30,
-                            30
-                        ),
-                        1
-                    )
\ No newline at end of file
+        import pygame  # Only drawing needs pygame; the game logic runs without it
+        color = self.color
+        for x, y in self.rotation_state.cells:
+            rect = ((self.x + x) * 30 + offset_x, (self.y + y) * 30 + offset_y, 30, 30)
+            pygame.draw.rect(screen, color, rect)
+            pygame.draw.rect(screen, (255, 255, 255), rect, 1)
+
+
+# (shape, colour) -> (piece, rotation), with a shape-only fallback for
+# blocks created with a colour that is not in Block.COLORS.
+_PIECE_LOOKUP = {}
+_SHAPE_LOOKUP = {}
+for _piece, _states in enumerate(Block.ROTATIONS):
+    for _rotation, _state in enumerate(_states):
+        _PIECE_LOOKUP.setdefault((_state.shape, Block.COLORS[_piece]), (_piece, _rotation))
+        _SHAPE_LOOKUP.setdefault(_state.shape, (_piece, _rotation))
+
+
+def _lookup_piece(shape, color):
+    shape = tuple(tuple(row) for row in shape)
+    found = _PIECE_LOOKUP.get((shape, tuple(color))) or _SHAPE_LOOKUP.get(shape)
+    if found is None:
+        raise ValueError(f"Unknown block shape: {shape}")
+    return found
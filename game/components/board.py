@@ -1,117 +1,479 @@
-import pygame
 from .block import Block
 
+# pygame (and the pygame-based atlas) are imported by the drawing methods
+# only, so the board logic can be used without loading pygame.
+
+_OCCUPIED = bytes([48] + [49] * 255)  # Palette index -> b'0' if empty else b'1'
+
+class _RowView:
+    """List-like view of one board row as colours (None for empty cells)."""
+
+    def __init__(self, board, y):
+        self._board = board
+        self._y = y
+
+    def __len__(self):
+        return self._board.WIDTH
+
+    def __getitem__(self, x):
+        board = self._board
+        start = self._y * board.WIDTH
+        if isinstance(x, slice):
+            palette = board.palette
+            return [palette[i] for i in board.cells[start:start + board.WIDTH][x]]
+        if x < 0:
+            x += board.WIDTH
+        if not 0 <= x < board.WIDTH:
+            raise IndexError("row index out of range")
+        return board.palette[board.cells[start + x]]
+
+    def __setitem__(self, x, color):
+        if x < 0:
+            x += self._board.WIDTH
+        self._board.set_cell(x, self._y, color)
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def __eq__(self, other):
+        try:
+            return self[:] == list(other)
+        except TypeError:
+            return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self[:])
+
+
+class _GridView:
+    """Compatibility view exposing the bitboard as the old HEIGHT x WIDTH colour grid."""
+
+    def __init__(self, board):
+        self._board = board
+
+    def __len__(self):
+        return self._board.HEIGHT
+
+    def __getitem__(self, y):
+        if isinstance(y, slice):
+            return [_RowView(self._board, i) for i in range(self._board.HEIGHT)[y]]
+        if y < 0:
+            y += self._board.HEIGHT
+        if not 0 <= y < self._board.HEIGHT:
+            raise IndexError("grid index out of range")
+        return _RowView(self._board, y)
+
+    def __setitem__(self, y, row):
+        if y < 0:
+            y += self._board.HEIGHT
+        for x, color in enumerate(row):
+            self._board.set_cell(x, y, color)
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def __eq__(self, other):
+        try:
+            return self._board.to_grid() == [list(row) for row in other]
+        except TypeError:
+            return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self._board.to_grid())
+
+
 class Board:
     WIDTH = 10
     HEIGHT = 20
     CELL_SIZE = 30
     ANIMATION_STEPS = 10  # Number of steps for the clearing animation
+    CLEAR_ANIMATION_MS = 80  # How long the clearing animation lasts when driven by time
+    FULL_ROW = (1 << WIDTH) - 1  # Row mask with every column occupied
 
     def __init__(self):
-        self.grid = [[None for _ in range(self.WIDTH)] for _ in range(self.HEIGHT)]
+        # One int bitmask per row (bit x set = column x occupied) plus a colour
+        # plane holding a palette index per cell (0 = empty). columns holds the
+        # same occupancy transposed (bit y set = row y occupied) for drop queries,
+        # and version counts changes so results can be cached against it.
+        self.rows = [0] * self.HEIGHT
+        self.columns = [0] * self.WIDTH
+        self.cells = bytearray(self.WIDTH * self.HEIGHT)
+        self.version = 0
+        self._ghost = (None, None)  # (pose and version, ghost Block) of the last ghost query
+        self._reset_stats()
+        self.palette = [None] + list(Block.COLORS)
+        self._palette_ids = {color: i for i, color in enumerate(self.palette) if color is not None}
+        self._sprites = {}  # Cell key -> (atlas surface, area)
         self.clearing_lines = []  # List of y coordinates for lines being cleared
         self.animation_progress = 0  # Shared progress for all clearing animations
         self.lines_cleared = 0  # Track the number of lines cleared
 
+    @property
+    def grid(self):
+        """Colour grid view of the board, kept for drawing and save/load compatibility."""
+        return _GridView(self)
+
+    @grid.setter
+    def grid(self, grid):
+        self.rows = [0] * self.HEIGHT
+        self.columns = [0] * self.WIDTH
+        self.cells = bytearray(self.WIDTH * self.HEIGHT)
+        self.version += 1
+        self._reset_stats()
+        for y, row in enumerate(grid):
+            for x, color in enumerate(row):
+                self.set_cell(x, y, color)
+
+    def to_grid(self):
+        """Return the board as a plain HEIGHT x WIDTH list of colours."""
+        palette = self.palette
+        return [[palette[i] for i in self.cells[y * self.WIDTH:(y + 1) * self.WIDTH]]
+                for y in range(self.HEIGHT)]
+
+    def load_cells(self, cells, palette):
+        """Replace the board with a row-major bytearray of indices into palette."""
+        self.palette = list(palette)
+        self._palette_ids = {color: i for i, color in enumerate(self.palette) if color is not None}
+        self._sprites = {}
+        self.cells = bytearray(cells)
+        self._rebuild_masks()
+
+    def _reset_stats(self):
+        """Zero the incrementally maintained statistics (for an empty board)."""
+        self._row_fill = bytearray(self.HEIGHT)  # Filled cells per row
+        self._column_fill = [0] * self.WIDTH  # Filled cells per column
+        self._heights = [0] * self.WIDTH
+        self._holes = 0
+        self._dirty_rows = set()  # Rows written since the last clear_lines()
+
+    def _rebuild_masks(self):
+        """Recompute the row and column masks and the statistics from the cells."""
+        width, height = self.WIDTH, self.HEIGHT
+        size = width * height
+        # One '0'/'1' digit per cell, reversed so each row or column slice
+        # reads most significant bit first for int(digits, 2)
+        bits = self.cells.translate(_OCCUPIED)[::-1]
+        row_bits = [bits[size - (y + 1) * width:size - y * width] for y in range(height)]
+        column_bits = [bits[width - 1 - x::width] for x in range(width)]
+        self.rows = [int(digits, 2) for digits in row_bits]
+        self.columns = [int(digits, 2) for digits in column_bits]
+        self.version += 1
+        self._reset_stats()
+        self._row_fill = bytearray(digits.count(49) for digits in row_bits)
+        self._column_fill = [digits.count(49) for digits in column_bits]
+        self._holes = -sum(self._column_fill)
+        self._dirty_rows.update(range(height))
+        self._update_heights(range(width))
+
+    def _column_height(self, x):
+        mask = self.columns[x]
+        return self.HEIGHT - (mask & -mask).bit_length() + 1 if mask else 0
+
+    def _update_heights(self, xs):
+        """Refresh the heights and hole count of columns xs after their masks changed."""
+        heights = self._heights
+        for x in xs:
+            height = self._column_height(x)
+            # A column's holes are its height minus its filled cells
+            self._holes += height - heights[x]
+            heights[x] = height
+
+    def color_id(self, color):
+        """Return the palette index for a colour, registering unknown colours."""
+        if color is None:
+            return 0
+        color = tuple(color)
+        index = self._palette_ids.get(color)
+        if index is None:
+            index = self._palette_ids[color] = len(self.palette)
+            self.palette.append(color)
+        return index
+
+    def set_cell(self, x, y, color):
+        """Set a single cell to a colour, or clear it with None."""
+        index = self.color_id(color)
+        i = y * self.WIDTH + x
+        change = bool(index) - bool(self.cells[i])
+        self.cells[i] = index
+        if index:
+            self.rows[y] |= 1 << x
+            self.columns[x] |= 1 << y
+        else:
+            self.rows[y] &= ~(1 << x)
+            self.columns[x] &= ~(1 << y)
+        self.version += 1
+        if change:
+            self._row_fill[y] += change
+            self._column_fill[x] += change
+            self._holes -= change
+            self._update_heights((x,))
+            self._dirty_rows.add(y)
+
     def is_valid_position(self, block):
-        for y, row in enumerate(block.shape):
-            for x, cell in enumerate(row):
-                if cell:
-                    board_x, board_y = block.x + x, block.y + y
-                    if (board_x < 0 or board_x >= self.WIDTH or
-                        board_y >= self.HEIGHT or
-                        (board_y >= 0 and self.grid[board_y][board_x] is not None)):
-                        return False
+        state = block.rotation_state
+        x, y = block.x, block.y
+        if x < 0 or x + state.width > self.WIDTH or y + state.height > self.HEIGHT:
+            return False
+        rows = self.rows
+        for dy, mask in enumerate(state.row_masks):
+            if y + dy >= 0 and rows[y + dy] & (mask << x):
+                return False
         return True
 
     def place_block(self, block):
-        for y, row in enumerate(block.shape):
-            for x, cell in enumerate(row):
-                if cell:
-                    self.grid[block.y + y][block.x + x] = block.color
+        state = block.rotation_state
+        index = block.piece + 1  # Palette slots 1..7 hold Block.COLORS
+        for dy, mask in enumerate(state.row_masks):
+            if block.y + dy >= 0:
+                self.rows[block.y + dy] |= mask << block.x
+        columns, cells = self.columns, self.cells
+        row_fill, column_fill = self._row_fill, self._column_fill
+        for x, y in state.cells:
+            x += block.x
+            y += block.y
+            if y >= 0:
+                i = y * self.WIDTH + x
+                if not cells[i]:
+                    row_fill[y] += 1
+                    column_fill[x] += 1
+                    self._holes -= 1
+                    self._dirty_rows.add(y)
+                cells[i] = index
+                columns[x] |= 1 << y
+        self.version += 1
+        self._update_heights(range(block.x, block.x + state.width))
+
+    @property
+    def heights(self):
+        """Height of each column (rows from the floor to its top cell)."""
+        return tuple(self._heights)
+
+    @property
+    def row_fill(self):
+        """Number of filled cells in each row, top row first."""
+        return bytes(self._row_fill)
+
+    @property
+    def holes(self):
+        """Number of empty cells with a filled cell above them in the same column."""
+        return self._holes
+
+    def drop_distance(self, block):
+        """How many rows block can fall from its pose before it lands.
+
+        Uses the column masks and the piece's bottom profile: for each of the
+        piece's columns, the nearest occupied cell below its lowest cell.
+        """
+        state = block.rotation_state
+        columns = self.columns
+        distance = self.HEIGHT
+        for dx, bottom in enumerate(state.bottoms):
+            below = block.y + bottom + 1  # First row under this column of the piece
+            mask = columns[block.x + dx]
+            mask = mask >> below if below >= 0 else mask << -below
+            # Free rows before the first occupied one (or the floor)
+            free = (mask & -mask).bit_length() - 1 if mask else self.HEIGHT - below
+            if free < distance:
+                distance = free
+        return distance
 
     def clear_lines(self):
-        self.lines_cleared = 0
-        # Identify all full lines
-        full_lines = []
-        for y in range(self.HEIGHT - 1, -1, -1):
-            if all(cell is not None for cell in self.grid[y]):
-                full_lines.append(y)
-                self.lines_cleared += 1
-        
+        # Only rows written since the last check can have become full
+        row_fill = self._row_fill
+        full_lines = sorted((y for y in self._dirty_rows if row_fill[y] == self.WIDTH), reverse=True)
+        self._dirty_rows.clear()
+        self.lines_cleared = len(full_lines)
+
         if full_lines:
             self.clearing_lines = full_lines
             self.animation_progress = 0
-            
+
         return self.lines_cleared
 
-    def update_clearing_animation(self):
+    def remove_lines(self, lines):
+        """Remove the given rows and shift everything above them down in one pass."""
+        removed = set(lines)
+        width = self.WIDTH
+        kept = [y for y in range(self.HEIGHT) if y not in removed]
+        rows = [0] * len(removed)
+        cells = bytearray(len(removed) * width)
+        row_fill = bytearray(len(removed))
+        column_fill = self._column_fill
+        for y in removed:
+            for x, index in enumerate(self.cells[y * width:(y + 1) * width]):
+                if index:
+                    column_fill[x] -= 1
+                    self._holes += 1
+        for y in kept:
+            rows.append(self.rows[y])
+            cells += self.cells[y * width:(y + 1) * width]
+            row_fill.append(self._row_fill[y])
+        self.rows = rows
+        self.cells = cells
+        self._row_fill = row_fill
+        # Every row changes index, so earlier writes no longer point at the right rows
+        self._dirty_rows = {y + sum(1 for r in removed if r > y) for y in self._dirty_rows if y not in removed}
+        columns = self.columns
+        for y in sorted(removed):
+            # Drop bit y from every column; the bits above it (smaller y) move down one
+            below = ~((2 << y) - 1)
+            above = (1 << y) - 1
+            for x in range(width):
+                mask = columns[x]
+                columns[x] = (mask & below) | ((mask & above) << 1)
+        self.version += 1
+        self._update_heights(range(width))
+
+    def update_clearing_animation(self, elapsed_ms=None):
+        """Advance the clearing animation one step, or to elapsed_ms after the lines filled."""
         if not self.clearing_lines:
             return
-            
-        self.animation_progress += 1
-        
+
+        if elapsed_ms is None:
+            self.animation_progress += 1
+        else:
+            self.animation_progress = max(self.animation_progress,
+                                          int(elapsed_ms) * self.ANIMATION_STEPS // self.CLEAR_ANIMATION_MS)
+
         if self.animation_progress >= self.ANIMATION_STEPS:
+            self.finish_clearing_animation()
+
+    def finish_clearing_animation(self):
+        """Skip the rest of the clearing animation and remove the cleared lines now."""
+        if self.clearing_lines:
             # Remove all cleared lines and insert new rows at top
-            # Sort lines in descending order first
-            sorted_lines = sorted(self.clearing_lines, reverse=True)
-            
-            # Remove all marked lines
-            for y in sorted_lines:
-                del self.grid[y]
-            
-            # Add new empty rows at the top equal to the number of cleared lines
-            for _ in range(len(sorted_lines)):
-                self.grid.insert(0, [None for _ in range(self.WIDTH)])
-            self.clearing_lines = []
-            self.animation_progress = 0
+            self.remove_lines(self.clearing_lines)
+        self.clearing_lines = []
+        self.animation_progress = 0
 
     def is_animation_complete(self):
         return len(self.clearing_lines) == 0
 
-    def draw(self, screen):
-        for y, row in enumerate(self.grid):
-            for x, cell in enumerate(row):
-                pygame.draw.rect(
-                    screen,
-                    (50, 50, 50),
-                    (x * self.CELL_SIZE, y * self.CELL_SIZE, self.CELL_SIZE, self.CELL_SIZE),
-                    1
-                )
-                if cell:
-                    if y in self.clearing_lines:
-                        # Draw clearing animation using shared progress
-                        alpha = int(255 * (1 - self.animation_progress / self.ANIMATION_STEPS))
-                        color = (*cell, alpha)
-                        surface = pygame.Surface((self.CELL_SIZE - 2, self.CELL_SIZE - 2), pygame.SRCALPHA)
-                        pygame.draw.rect(surface, color, (0, 0, self.CELL_SIZE - 2, self.CELL_SIZE - 2))
-                        screen.blit(surface, (x * self.CELL_SIZE + 1, y * self.CELL_SIZE + 1))
-                    else:
-                        # Draw normal block
-                        pygame.draw.rect(
-                            screen,
-                            cell,
-                            (x * self.CELL_SIZE + 1, y * self.CELL_SIZE + 1, self.CELL_SIZE - 2, self.CELL_SIZE - 2)
-                        )
+    def cell_keys(self, block=None, ghost=None):
+        """Return how each cell should look, as one comparable key per cell (row-major).
 
-    def get_ghost_position(self, block):
-        ghost_block = Block(block.shape, block.color)
-        ghost_block.x, ghost_block.y = block.x, block.y
+        Keys are the palette index for settled cells, ('fade', index, progress)
+        for cells in clearing rows, 'ghost' for the ghost outline and
+        ('block', color, ghost_on_top) for cells of the falling block.
+        """
+        keys = list(self.cells)
+        width = self.WIDTH
+        for y in self.clearing_lines:
+            for i in range(y * width, (y + 1) * width):
+                if keys[i]:
+                    keys[i] = ('fade', keys[i], self.animation_progress)
+        ghost_cells = set()
+        if ghost is not None:
+            for x, y in ghost.rotation_state.cells:
+                if ghost.y + y >= 0:
+                    i = (ghost.y + y) * width + ghost.x + x
+                    keys[i] = 'ghost'
+                    ghost_cells.add(i)
+        if block is not None:
+            color = block.color
+            for x, y in block.rotation_state.cells:
+                if block.y + y >= 0:
+                    i = (block.y + y) * width + block.x + x
+                    keys[i] = ('block', color, i in ghost_cells)
+        return keys
+
+    def cell_rect(self, index):
+        """Screen rect of the cell at a row-major index."""
+        import pygame
+        size = self.CELL_SIZE
+        y, x = divmod(index, self.WIDTH)
+        return pygame.Rect(x * size, y * size, size, size)
 
-        while self.is_valid_position(ghost_block):
-            ghost_block.y += 1
+    def sprite(self, key):
+        """Return the (surface, area) atlas sprite for a cell key."""
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            from .atlas import shared_atlas
+            atlas = shared_atlas(Block.COLORS, self.CELL_SIZE, self.ANIMATION_STEPS)
+            if key == 'ghost':
+                sprite = atlas.ghost()
+            elif isinstance(key, int):
+                sprite = atlas.cell(self.palette[key]) if key else atlas.empty()
+            elif key[0] == 'fade':
+                sprite = atlas.fade(self.palette[key[1]], key[2])
+            else:
+                sprite = atlas.block(key[1], key[2])
+            self._sprites[key] = sprite
+        return sprite
+
+    def draw_cell(self, screen, index, key):
+        """Draw one cell (background, grid outline and contents) from its key."""
+        surface, area = self.sprite(key)
+        screen.blit(surface, self.cell_rect(index), area)
+
+    def draw(self, screen, block=None, ghost=None):
+        """Draw every cell, with the falling block and its ghost if given; returns the cell keys."""
+        keys = self.cell_keys(block, ghost)
+        sprite = self.sprite
+        size = self.CELL_SIZE
+        width = self.WIDTH
+        blits = []
+        for i, key in enumerate(keys):
+            surface, area = sprite(key)
+            blits.append((surface, ((i % width) * size, (i // width) * size), area))
+        screen.blits(blits, False)
+        return keys
+
+    def draw_changed(self, screen, previous, block=None, ghost=None, areas=()):
+        """Redraw only the cells whose key differs from previous, plus any cell touching areas.
+
+        previous is the key list returned by the last draw; returns (keys,
+        dirty_rects) so the caller can pass the rects to pygame.display.update.
+        """
+        import pygame
+        if previous is None:
+            keys = self.draw(screen, block, ghost)
+            return keys, [pygame.Rect(0, 0, self.WIDTH * self.CELL_SIZE, self.HEIGHT * self.CELL_SIZE)]
+        keys = self.cell_keys(block, ghost)
+        if keys == previous and not areas:
+            return keys, []
+        dirty = []
+        blits = []
+        size = self.CELL_SIZE
+        width = self.WIDTH
+        for i, key in enumerate(keys):
+            changed = key != previous[i]
+            if not changed and not areas:
+                continue
+            y, x = divmod(i, width)
+            rect = pygame.Rect(x * size, y * size, size, size)
+            if changed or rect.collidelist(areas) != -1:
+                surface, area = self.sprite(key)
+                blits.append((surface, rect, area))
+                dirty.append(rect)
+        screen.blits(blits, False)
+        return keys, dirty
+
+    def get_ghost_position(self, block):
+        """Return where block would land if hard-dropped.
 
-        ghost_block.y -= 1
+        The result is cached until the block moves or the board changes, so the
+        same Block may be returned again; treat it as read-only.
+        """
+        key = (block.piece, block.rotation, block.x, block.y, self.version)
+        cached_key, ghost_block = self._ghost
+        if key != cached_key:
+            ghost_block = block.copy()
+            ghost_block.y += self.drop_distance(block)
+            self._ghost = (key, ghost_block)
         return ghost_block
 
     def draw_ghost(self, screen, block):
+        import pygame
         ghost_block = self.get_ghost_position(block)
-        for y, row in enumerate(ghost_block.shape):
-            for x, cell in enumerate(row):
-                if cell:
-                    pygame.draw.rect(
-                        screen,
-                        (100, 100, 100),
-                        ((ghost_block.x + x) * self.CELL_SIZE, (ghost_block.y + y) * self.CELL_SIZE, self.CELL_SIZE, self.CELL_SIZE),
-                        1
-                    )
+        for x, y in ghost_block.rotation_state.cells:
+            pygame.draw.rect(
+                screen,
+                (100, 100, 100),
+                ((ghost_block.x + x) * self.CELL_SIZE, (ghost_block.y + y) * self.CELL_SIZE, self.CELL_SIZE, self.CELL_SIZE),
+                1
+            )
@@ -1,13 +1,192 @@
 import sqlite3
 import os
 import datetime
+import atexit
+import queue
+import threading
+from bisect import bisect_right
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+# Schema changes applied on top of the tables in create_tables, in order.
+# PRAGMA user_version records how many have been applied to a file, so
+# existing databases are upgraded the first time they are opened.
+MIGRATIONS = (
+    # 1: leaderboard and per-player lookups without a full scan and sort
+    (
+        "CREATE INDEX IF NOT EXISTS idx_scores_score ON scores (score DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_scores_player_score ON scores (player_name, score DESC)",
+    ),
+    # 2: game states are binary (game/savestate.py); legacy JSON text rows are kept
+    (
+        """CREATE TABLE game_states_new (
+            player_name TEXT PRIMARY KEY,
+            game_state BLOB NOT NULL,
+            timestamp TEXT NOT NULL
+        )""",
+        "INSERT INTO game_states_new SELECT player_name, game_state, timestamp FROM game_states",
+        "DROP TABLE game_states",
+        "ALTER TABLE game_states_new RENAME TO game_states",
+    ),
+    # 3: autosave ring buffer (game/autosave.py); keyframe is the sequence a delta applies to
+    (
+        """CREATE TABLE autosaves (
+            player_name TEXT NOT NULL,
+            slot INTEGER NOT NULL,
+            sequence INTEGER NOT NULL,
+            keyframe INTEGER NOT NULL,
+            game_state BLOB NOT NULL,
+            timestamp TEXT NOT NULL,
+            PRIMARY KEY (player_name, slot)
+        )""",
+        "CREATE INDEX idx_autosaves_sequence ON autosaves (player_name, sequence)",
+    ),
+    # 4: replays (game/replay.py); duration is in milliseconds
+    (
+        """CREATE TABLE replays (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            player_name TEXT NOT NULL,
+            seed INTEGER NOT NULL,
+            actions BLOB NOT NULL,
+            duration INTEGER NOT NULL,
+            score INTEGER NOT NULL,
+            level INTEGER NOT NULL,
+            lines_cleared INTEGER NOT NULL,
+            date_time TEXT NOT NULL
+        )""",
+    ),
+    # 5: replays record which piece randomizer (game/pieces.py) dealt the game
+    (
+        "ALTER TABLE replays ADD COLUMN randomizer TEXT NOT NULL DEFAULT 'uniform'",
+    ),
+)
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def configure_connection(conn):
+    """Apply the connection pragmas every TetrisDatabase connection uses."""
+    # WAL lets readers run alongside a writer and makes commits cheap;
+    # NORMAL only syncs at checkpoints, which is safe in WAL mode.
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA cache_size = -16000")  # 16 MB page cache
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA mmap_size = 268435456")  # Read through a 256 MB mapping
+
+
+class DatabaseWriter:
+    """Runs queued writes on a background thread with its own connection.
+
+    Whatever is waiting in the queue when the thread wakes up is written in a
+    single transaction (at most max_batch statements), so a burst of saves
+    costs one commit. Each write returns a Future that resolves to True once
+    its transaction has committed, or False if it failed. Pending writes are
+    flushed when the writer is closed or the interpreter exits.
+    """
+
+    def __init__(self, db_path, max_batch=100):
+        self.db_path = db_path
+        self.max_batch = max_batch
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="TetrisDatabaseWriter", daemon=True)
+        self.closed = False
+        self.thread.start()
+        atexit.register(self.close)
+
+    def submit(self, sql, params=(), many=False):
+        """Queue a statement (or executemany with many=True); returns a Future."""
+        future = Future()
+        if self.closed:
+            future.set_result(False)
+            return future
+        self.queue.put((sql, params, many, future))
+        return future
+
+    def flush(self, timeout=None):
+        """Wait until every write queued so far has been committed."""
+        if self.closed:
+            return True
+        future = self.submit(None)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            return False
+
+    def close(self):
+        """Flush pending writes and stop the thread."""
+        if self.closed:
+            return
+        self.queue.put(None)
+        self.thread.join()
+        self.closed = True
+        atexit.unregister(self.close)
+
+    def _run(self):
+        try:
+            conn = sqlite3.connect(self.db_path)
+            configure_connection(conn)
+        except sqlite3.Error as e:
+            print(f"Database writer connection error: {e}")
+            conn = None
+        stop = False
+        while not stop:
+            batch = [self.queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                stop = True
+                batch = batch[:batch.index(None)]
+            self._write(conn, batch)
+        if conn is not None:
+            conn.close()
+
+    def _write(self, conn, batch):
+        results = []
+        try:
+            if conn is None:
+                raise sqlite3.Error("no connection")
+            conn.execute("BEGIN")
+            for sql, params, many, _ in batch:
+                if sql is None:  # flush marker
+                    results.append(True)
+                    continue
+                # A failing statement only rolls back its own savepoint
+                conn.execute("SAVEPOINT write")
+                try:
+                    if many:
+                        conn.executemany(sql, params)
+                    else:
+                        conn.execute(sql, params)
+                    results.append(True)
+                except sqlite3.Error as e:
+                    print(f"Error in queued database write: {e}")
+                    conn.execute("ROLLBACK TO write")
+                    results.append(False)
+                conn.execute("RELEASE write")
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"Error committing queued database writes: {e}")
+            if conn is not None and conn.in_transaction:
+                conn.rollback()
+            results = [False] * len(batch)
+        for (_, _, _, future), result in zip(batch, results):
+            future.set_result(result)
 
 class TetrisDatabase:
-    def __init__(self, db_path="tetris_scores.db"):
+    def __init__(self, db_path="tetris_scores.db", leaderboard_size=10):
         """Initialize the database connection and create tables if they don't exist."""
         self.db_path = db_path
         self.conn = None
         self.cursor = None
+        # In-memory copy of the top leaderboard_size scores, best first. It is
+        # updated in place by save_score and reloaded when another connection
+        # changes the file (PRAGMA data_version moves).
+        self.leaderboard_size = leaderboard_size
+        self._leaderboard = None
+        self._data_version = None
+        self._writer = None  # DatabaseWriter, started by the first asynchronous write
         self.connect()
         self.create_tables()
     
@@ -16,6 +195,7 @@ class TetrisDatabase:
         try:
             self.conn = sqlite3.connect(self.db_path)
             self.cursor = self.conn.cursor()
+            configure_connection(self.conn)
         except sqlite3.Error as e:
             print(f"Database connection error: {e}")
     
@@ -40,9 +220,42 @@ class TetrisDatabase:
                 timestamp TEXT NOT NULL
             )
             ''')
+            self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS ai_results (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id TEXT NOT NULL,
+                agent TEXT NOT NULL,
+                config TEXT NOT NULL,
+                seed INTEGER NOT NULL,
+                score INTEGER NOT NULL,
+                level INTEGER NOT NULL,
+                lines_cleared INTEGER NOT NULL,
+                pieces INTEGER NOT NULL,
+                duration REAL NOT NULL,
+                date_time TEXT NOT NULL
+            )
+            ''')
             self.conn.commit()
+            self.migrate()
         except sqlite3.Error as e:
             print(f"Error creating tables: {e}")
+
+    def schema_version(self):
+        """Return how many MIGRATIONS have been applied to the database file."""
+        return self.cursor.execute("PRAGMA user_version").fetchone()[0]
+
+    def migrate(self):
+        """Apply any MIGRATIONS newer than the file's schema version, one transaction each."""
+        for version in range(self.schema_version(), SCHEMA_VERSION):
+            self.cursor.execute("BEGIN")
+            try:
+                for statement in MIGRATIONS[version]:
+                    self.cursor.execute(statement)
+                self.cursor.execute(f"PRAGMA user_version = {version + 1}")
+                self.conn.commit()
+            except sqlite3.Error:
+                self.conn.rollback()
+                raise
     
     def calculate_grade(self, score, level):
         """Calculate a grade based on score and level."""
@@ -72,25 +285,47 @@ class TetrisDatabase:
             ''', (player_name, score, level, lines_cleared, grade, date_time))
             
             self.conn.commit()
+            self._add_to_leaderboard((player_name, score, level, lines_cleared, grade, date_time))
             return True
         except sqlite3.Error as e:
             print(f"Error saving score: {e}")
             return False
     
     def get_high_scores(self, limit=10):
-        """Get the top scores from the database."""
+        """Get the top scores, served from the in-memory leaderboard."""
         try:
-            self.cursor.execute('''
-            SELECT player_name, score, level, lines_cleared, grade, date_time
-            FROM scores
-            ORDER BY score DESC
-            LIMIT ?
-            ''', (limit,))
-            
-            return self.cursor.fetchall()
+            if limit > self.leaderboard_size:
+                self.leaderboard_size = limit
+                self._leaderboard = None
+            data_version = self.cursor.execute("PRAGMA data_version").fetchone()[0]
+            if self._leaderboard is None or data_version != self._data_version:
+                self._leaderboard = self._query_high_scores(self.leaderboard_size)
+                self._data_version = data_version
+            return self._leaderboard[:limit]
         except sqlite3.Error as e:
             print(f"Error retrieving high scores: {e}")
             return []
+
+    def _query_high_scores(self, limit):
+        self.cursor.execute('''
+        SELECT player_name, score, level, lines_cleared, grade, date_time
+        FROM scores
+        ORDER BY score DESC
+        LIMIT ?
+        ''', (limit,))
+
+        return self.cursor.fetchall()
+
+    def _add_to_leaderboard(self, row):
+        """Insert a newly saved score into the cached leaderboard, if it is loaded."""
+        if self._leaderboard is None:
+            return
+        # Equal scores keep insertion order, like the rowid order of the query
+        keys = [-entry[1] for entry in self._leaderboard]
+        position = bisect_right(keys, -row[1])
+        if position < self.leaderboard_size:
+            self._leaderboard.insert(position, row)
+            del self._leaderboard[self.leaderboard_size:]
     
     def get_player_scores(self, player_name, limit=10):
         """Get scores for a specific player."""
@@ -109,12 +344,66 @@ class TetrisDatabase:
             return []
     
     def close(self):
-        """Close the database connection."""
+        """Flush queued writes and close the database connection."""
+        if self._writer:
+            self._writer.close()
+            self._writer = None
         if self.conn:
             self.conn.close()
 
-    def save_game_state(self, player_name, game_state_json):
-        """Save a game state to the database."""
+    def submit_write(self, sql, params=(), many=False):
+        """Queue a write for the background writer; returns a Future resolving to True/False.
+
+        An in-memory database cannot be shared with another connection, so there
+        the write runs immediately on this connection instead.
+        """
+        if self.db_path == ":memory:":
+            future = Future()
+            try:
+                with self.conn:
+                    if many:
+                        self.cursor.executemany(sql, params)
+                    else:
+                        self.cursor.execute(sql, params)
+                # This connection's own commits do not move PRAGMA data_version,
+                # so drop the cached leaderboard in case the write changed scores
+                self._leaderboard = None
+                future.set_result(True)
+            except sqlite3.Error as e:
+                print(f"Error in database write: {e}")
+                future.set_result(False)
+            return future
+        if self._writer is None:
+            self._writer = DatabaseWriter(self.db_path)
+        return self._writer.submit(sql, params, many)
+
+    def flush(self, timeout=None):
+        """Wait for every queued write to be committed."""
+        if self._writer is None:
+            return True
+        return self._writer.flush(timeout)
+
+    def save_score_async(self, player_name, score, level, lines_cleared):
+        """Queue a game score; returns a Future that resolves once it is committed."""
+        grade = self.calculate_grade(score, level)
+        date_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # The leaderboard reloads through PRAGMA data_version once the writer commits
+        # (inline in-memory writes drop the cache in submit_write instead)
+        return self.submit_write('''
+        INSERT INTO scores (player_name, score, level, lines_cleared, grade, date_time)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ''', (player_name, score, level, lines_cleared, grade, date_time))
+
+    def save_game_state_async(self, player_name, game_state):
+        """Queue a game state save; returns a Future that resolves once it is committed."""
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return self.submit_write('''
+        INSERT OR REPLACE INTO game_states (player_name, game_state, timestamp)
+        VALUES (?, ?, ?)
+        ''', (player_name, game_state, timestamp))
+
+    def save_game_state(self, player_name, game_state):
+        """Save a game state (binary save or legacy JSON text) to the database."""
         try:
             if not self.conn or not self.cursor:
                 self.connect()
@@ -124,7 +413,7 @@ class TetrisDatabase:
             self.cursor.execute('''
             INSERT OR REPLACE INTO game_states (player_name, game_state, timestamp)
             VALUES (?, ?, ?)
-            ''', (player_name, game_state_json, timestamp))
+            ''', (player_name, game_state, timestamp))
             
             self.conn.commit()
             return True
@@ -137,6 +426,7 @@ class TetrisDatabase:
         try:
             if not self.conn or not self.cursor:
                 self.connect()
+            self.flush()  # Include saves still waiting in the writer queue
             
             self.cursor.execute('''
             SELECT game_state FROM game_states WHERE player_name = ?
@@ -150,3 +440,130 @@ class TetrisDatabase:
         except sqlite3.Error as e:
             print(f"Error loading game state: {e}")
             return None
+
+    def save_autosave_async(self, player_name, slot, sequence, keyframe, game_state, clear_slots=()):
+        """Queue an autosave into a slot, first deleting clear_slots; returns a Future for the save."""
+        if clear_slots:
+            self.submit_write("DELETE FROM autosaves WHERE player_name = ? AND slot = ?",
+                              [(player_name, other) for other in clear_slots], many=True)
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return self.submit_write('''
+        INSERT OR REPLACE INTO autosaves (player_name, slot, sequence, keyframe, game_state, timestamp)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ''', (player_name, slot, sequence, keyframe, game_state, timestamp))
+
+    def get_autosaves(self, player_name):
+        """List a player's autosaves as (slot, sequence, keyframe, timestamp), newest first."""
+        try:
+            self.flush()
+            self.cursor.execute('''
+            SELECT slot, sequence, keyframe, timestamp FROM autosaves
+            WHERE player_name = ?
+            ORDER BY sequence DESC
+            ''', (player_name,))
+            return self.cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Error listing autosaves: {e}")
+            return []
+
+    def load_autosave(self, player_name, slot):
+        """Load an autosave slot as (game_state, keyframe_state).
+
+        keyframe_state is None when the slot holds a keyframe; for a delta it
+        is the save the delta applies to. Returns None for an empty slot.
+        """
+        try:
+            self.flush()
+            self.cursor.execute('''
+            SELECT sequence, keyframe, game_state FROM autosaves
+            WHERE player_name = ? AND slot = ?
+            ''', (player_name, slot))
+            row = self.cursor.fetchone()
+            if not row:
+                return None
+            sequence, keyframe, game_state = row
+            if keyframe == sequence:
+                return game_state, None
+            self.cursor.execute('''
+            SELECT game_state FROM autosaves
+            WHERE player_name = ? AND sequence = ?
+            ''', (player_name, keyframe))
+            base = self.cursor.fetchone()
+            if not base:
+                print(f"Autosave slot {slot} refers to a keyframe that no longer exists")
+                return None
+            return game_state, base[0]
+        except sqlite3.Error as e:
+            print(f"Error loading autosave: {e}")
+            return None
+
+    def save_replay_async(self, player_name, seed, actions, duration, score, level, lines_cleared,
+                          randomizer="uniform"):
+        """Queue a recorded game; returns a Future that resolves once it is committed."""
+        date_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return self.submit_write('''
+        INSERT INTO replays (player_name, seed, actions, duration, score, level, lines_cleared,
+                             randomizer, date_time)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (player_name, seed, actions, duration, score, level, lines_cleared, randomizer, date_time))
+
+    def get_replays(self, limit=20):
+        """List recorded games as (id, player_name, score, level, lines_cleared, duration, date_time), newest first."""
+        try:
+            self.flush()
+            self.cursor.execute('''
+            SELECT id, player_name, score, level, lines_cleared, duration, date_time
+            FROM replays
+            ORDER BY id DESC
+            LIMIT ?
+            ''', (limit,))
+            return self.cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Error listing replays: {e}")
+            return []
+
+    def load_replay(self, replay_id):
+        """Load a recorded game as (player_name, seed, actions, randomizer), or None."""
+        try:
+            self.flush()
+            self.cursor.execute('''
+            SELECT player_name, seed, actions, randomizer FROM replays WHERE id = ?
+            ''', (replay_id,))
+            return self.cursor.fetchone()
+        except sqlite3.Error as e:
+            print(f"Error loading replay: {e}")
+            return None
+
+    def save_ai_results(self, results):
+        """Save many AI game results in a single transaction.
+
+        results is an iterable of (run_id, agent, config, seed, score, level,
+        lines_cleared, pieces, duration) tuples.
+        """
+        try:
+            date_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            with self.conn:
+                self.cursor.executemany('''
+                INSERT INTO ai_results (run_id, agent, config, seed, score, level,
+                                        lines_cleared, pieces, duration, date_time)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (tuple(result) + (date_time,) for result in results))
+            return True
+        except sqlite3.Error as e:
+            print(f"Error saving AI results: {e}")
+            return False
+
+    def get_ai_results(self, run_id):
+        """Get the AI game results of one tournament run."""
+        try:
+            self.cursor.execute('''
+            SELECT agent, config, seed, score, level, lines_cleared, pieces, duration
+            FROM ai_results
+            WHERE run_id = ?
+            ORDER BY id
+            ''', (run_id,))
+
+            return self.cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Error retrieving AI results: {e}")
+            return []
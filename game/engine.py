@@ -0,0 +1,428 @@
+import json
+import random
+import struct
+from concurrent.futures import Future
+
+from . import replay, savestate
+from .autosave import Autosaver
+from .pieces import make_source
+from .components.block import Block
+from .components.board import Board
+
+
+def _completed(result):
+    """A Future that is already resolved, for saves that never reach a database."""
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+class NullSound:
+    """Sound sink that accepts every Sound call and plays nothing."""
+
+    def __init__(self):
+        self.muted = False
+
+    def play_rotate(self):
+        pass
+
+    def play_clear(self):
+        pass
+
+    def play_drop(self):
+        pass
+
+    def play_game_over(self):
+        pass
+
+    def start_background_music(self):
+        pass
+
+    def stop_background_music(self):
+        pass
+
+    def toggle_mute(self):
+        self.muted = not self.muted
+        return self.muted
+
+
+# Rate of Game's fixed-timestep simulation, independent of the render rate
+SIMULATION_HZ = 60
+
+
+class TickClock:
+    """Millisecond clock that only moves when advanced, for wall-clock-free simulation."""
+
+    def __init__(self, ms_per_tick=1000 / 120):
+        self.ms_per_tick = ms_per_tick
+        self.ticks = 0
+
+    def advance(self, ticks=1):
+        self.ticks += ticks
+
+    def __call__(self):
+        return int(self.ticks * self.ms_per_tick)
+
+
+class Engine:
+    """Pure game logic: no display, no audio device and no database required.
+
+    The engine can be stepped by frames (step_frames, gravity driven by the
+    injected clock) or by whole piece placements (place). Each game has a
+    seed for its pieces, so a game recorded as actions (see game/replay.py)
+    can be reproduced exactly.
+    """
+
+    def __init__(self, player_name="Anonymous", db=None, sound=None, clock=None, seed=None,
+                 randomizer="uniform"):
+        self.player_name = player_name
+        self.db = db
+        self.sound = sound if sound is not None else NullSound()
+        self.clock = clock if clock is not None else TickClock()
+        self.randomizer = randomizer
+        self.rng = None
+        self.autosaver = None
+        self.recording = False
+        self.reset(seed)
+
+    @classmethod
+    def from_replay(cls, seed, events, randomizer="uniform"):
+        """Re-simulate a recorded game headless; returns the engine in its final state."""
+        engine = cls(seed=seed, randomizer=randomizer)
+        for _, action, arg in events:
+            engine.perform(action, arg)
+        return engine
+
+    def reset(self, seed=None):
+        """Start a new game with the same player, database, sound and clock.
+
+        Without a seed the game's seed is drawn from the previous game's
+        generator, so a seeded engine stays deterministic across restarts.
+        """
+        if seed is None:
+            seed = self.rng.getrandbits(63) if self.rng is not None else random.getrandbits(63)
+        self.seed = seed
+        self.rng = random.Random(seed)  # Seeds the next game
+        self.pieces = make_source(self.randomizer, seed)
+        self.board = Board()
+        self.current_block = None
+        self.next_block = None
+        self.score = 0
+        self.level = 1
+        self.lines_cleared = 0
+        self.pieces_placed = 0
+        self.game_over = False
+        self.fall_time = 0
+        self.fall_speed = 0.5  # Initial fall speed
+        self.paused = False
+        self.clearing_animation = False
+        self.clear_started = 0
+        self.score_saved = False
+        self.recorder = None
+
+        self.generate_new_block()
+        if self.recording:
+            self.recorder = replay.Recorder(self.seed, self.clock(), self.randomizer)
+
+    def generate_new_block(self):
+        if not self.next_block:
+            self.next_block = Block.from_piece(self.pieces.next())
+        self.current_block = self.next_block
+        self.next_block = Block.from_piece(self.pieces.next())
+        self.current_block.x = self.board.WIDTH // 2 - self.current_block.rotation_state.width // 2
+        self.current_block.y = 0
+
+        if not self.board.is_valid_position(self.current_block):
+            self.game_over = True
+            self.sound.play_game_over()
+            self.sound.stop_background_music()
+
+            # Save score to database when game ends, without waiting for the commit
+            if not self.score_saved and self.score > 0:
+                self.save_score_async()
+                self.score_saved = True
+            if self.recorder is not None:
+                self.save_replay_async()
+        elif self.autosaver is not None:
+            # A new block means the previous one has been placed
+            self.autosaver.save(self)
+
+    def preview(self, count):
+        """Return the next count pieces, starting with next_block's, without taking them."""
+        if count <= 0:
+            return []
+        first = [self.next_block.piece] if self.next_block else []
+        return first + self.pieces.preview(count - len(first))
+
+    def move_block(self, dx, dy):
+        self.current_block.move(dx, dy)
+        if not self.board.is_valid_position(self.current_block):
+            self.current_block.move(-dx, -dy)
+            if dy > 0:
+                self.place_block()
+
+    def rotate_block(self):
+        self.current_block.rotate()
+        if self.board.is_valid_position(self.current_block):
+            self.sound.play_rotate()
+        else:
+            self.current_block.rotate(-1)
+
+    def drop_block(self):
+        if self.board.is_valid_position(self.current_block):
+            self.current_block.y += self.board.drop_distance(self.current_block)
+        else:
+            self.current_block.move(0, -1)
+        self.place_block()
+        self.sound.play_drop()
+
+    def place_block(self):
+        self.board.place_block(self.current_block)
+        self.pieces_placed += 1
+        lines_cleared = self.board.clear_lines()
+        if lines_cleared > 0:
+            self.clearing_animation = True
+            self.clear_started = self.clock()
+            self.sound.play_clear()
+        else:
+            self.generate_new_block()
+
+    def perform(self, action, arg=0):
+        """Apply one replay action (game/replay.py), recording it if this game is being recorded."""
+        if self.clearing_animation:
+            # Actions only arrive once a line clear has finished; replays skip the animation
+            self.board.finish_clearing_animation()
+            self.finish_line_clear()
+        if self.game_over:
+            return
+        if action == replay.PLACE:
+            self.place(*replay.unpack_place_arg(arg))  # place() records itself
+            return
+        if self.recorder is not None:
+            self.recorder.record(self.clock(), action, arg)
+        if action == replay.LEFT:
+            self.move_block(-1, 0)
+        elif action == replay.RIGHT:
+            self.move_block(1, 0)
+        elif action in (replay.SOFT_DROP, replay.GRAVITY):
+            self.move_block(0, 1)
+        elif action == replay.ROTATE:
+            self.rotate_block()
+        elif action == replay.HARD_DROP:
+            self.drop_block()
+
+    def update_score(self, lines_cleared):
+        self.lines_cleared += lines_cleared
+        self.score += [0, 40, 100, 300, 1200][lines_cleared] * self.level
+        self.level = min(20, 1 + self.lines_cleared // 10)
+        self.fall_speed = max(0.05, 0.5 - (self.level - 1) * 0.02)  # Increase speed with level
+
+    def update(self):
+        if not self.game_over and not self.paused:
+            if self.clearing_animation:
+                self.board.update_clearing_animation(self.clock() - self.clear_started)
+                if self.board.is_animation_complete():
+                    self.finish_line_clear()
+            else:
+                now = self.clock()
+                if now - self.fall_time > self.fall_speed * 1000:
+                    self.fall_time = now
+                    self.perform(replay.GRAVITY)
+
+    def finish_line_clear(self):
+        self.clearing_animation = False
+        lines_cleared = self.board.lines_cleared
+        self.update_score(lines_cleared)
+        self.generate_new_block()
+
+    def step_frames(self, frames=1):
+        """Advance a TickClock-driven engine by a number of frames."""
+        for _ in range(frames):
+            if self.game_over:
+                break
+            self.clock.advance()
+            self.update()
+
+    def place(self, rotation, x):
+        """Hard-drop the current block at a rotation and column, finishing any line clear at once.
+
+        Returns the number of lines cleared, or None if the placement is not
+        legal from the block's current height or the game is over.
+        """
+        if self.game_over or self.clearing_animation:
+            return None
+        block = Block.from_piece(self.current_block.piece, rotation, x, self.current_block.y)
+        if not self.board.is_valid_position(block):
+            return None
+        if self.recorder is not None:
+            self.recorder.record(self.clock(), replay.PLACE, replay.place_arg(rotation, x))
+        self.current_block = block
+        self.drop_block()
+        lines_cleared = self.board.lines_cleared
+        if self.clearing_animation:
+            self.board.finish_clearing_animation()
+            self.finish_line_clear()
+        return lines_cleared
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+        if self.paused:
+            self.sound.stop_background_music()
+        else:
+            self.sound.start_background_music()
+
+    def toggle_mute(self):
+        """Toggle mute state for all game sounds."""
+        is_muted = self.sound.toggle_mute()
+        return is_muted
+
+    def save_score(self):
+        """Save the current game score to the database."""
+        if self.db is None:
+            return False
+        return self.db.save_score(self.player_name, self.score, self.level, self.lines_cleared)
+
+    def save_score_async(self):
+        """Queue the current score for the database writer; returns a Future resolving to True/False."""
+        if self.db is None:
+            return _completed(False)
+        return self.db.save_score_async(self.player_name, self.score, self.level, self.lines_cleared)
+
+    def get_high_scores(self, limit=10):
+        """Get the top scores from the database."""
+        if self.db is None:
+            return []
+        return self.db.get_high_scores(limit)
+
+    def set_player_name(self, name):
+        """Set the player name."""
+        self.player_name = name if name else "Anonymous"
+
+    def save_state(self):
+        """Save the current game state to the database."""
+        serialized_state = self.serialize_state() if self.db is not None else None
+        if serialized_state is None:
+            return False
+        return self.db.save_game_state(self.player_name, serialized_state)
+
+    def save_state_async(self):
+        """Queue the current game state for the database writer; returns a Future resolving to True/False."""
+        serialized_state = self.serialize_state() if self.db is not None else None
+        if serialized_state is None:
+            return _completed(False)
+        return self.db.save_game_state_async(self.player_name, serialized_state)
+
+    def enable_recording(self):
+        """Record this game's actions from now on, and every later game's, as replays."""
+        self.recording = True
+        self.recorder = replay.Recorder(self.seed, self.clock(), self.randomizer)
+
+    def save_replay_async(self):
+        """Queue the recorded replay of the current game; returns a Future resolving to True/False."""
+        if self.db is None or self.recorder is None:
+            return _completed(False)
+        recorder = self.recorder
+        return self.db.save_replay_async(self.player_name, recorder.seed, replay.encode(recorder.events),
+                                         recorder.duration, self.score, self.level, self.lines_cleared,
+                                         recorder.randomizer)
+
+    def enable_autosave(self, slots=8, keyframe_interval=4):
+        """Autosave after every placement into a ring of slots (see game/autosave.py)."""
+        if self.db is None:
+            return False
+        self.autosaver = Autosaver(self.db, self.player_name, slots, keyframe_interval)
+        return True
+
+    def serialize_state(self, compress=False):
+        """Return the game state in the binary save format, or None if it cannot be saved."""
+        if not self.current_block or not self.next_block:
+            # Cannot save if blocks are not initialized (e.g., very start or end of game)
+            return None
+        try:
+            return savestate.encode(self, compress)
+        except (savestate.SaveStateError, struct.error) as e:
+            print(f"Error serializing game state: {e}")
+            return None
+
+    def load_state(self, slot=None):
+        """Load the game state from the database (binary or legacy JSON saves).
+
+        With a slot, restore that autosave instead of the manual save.
+        """
+        if self.db is None:
+            return False
+        if slot is not None:
+            return self._load_autosave(slot)
+        serialized_state = self.db.load_game_state(self.player_name)
+        if not serialized_state:
+            return False
+        try:
+            if savestate.is_binary(serialized_state):
+                self.restore_state(savestate.decode(serialized_state))
+            else:
+                self.restore_state(self._decode_json_state(serialized_state))
+        except (TypeError, KeyError, ValueError) as e:
+            # ValueError covers json.JSONDecodeError and savestate.SaveStateError
+            print(f"Error loading or parsing game state: {e}")
+            return False
+        return True
+
+    def _load_autosave(self, slot):
+        saved = self.db.load_autosave(self.player_name, slot)
+        if not saved:
+            return False
+        serialized_state, keyframe = saved
+        try:
+            base = savestate.decode(keyframe) if keyframe is not None else None
+            self.restore_state(savestate.decode(serialized_state, base))
+        except ValueError as e:
+            print(f"Error loading autosave: {e}")
+            return False
+        return True
+
+    @staticmethod
+    def _decode_json_state(serialized_state):
+        """Turn a save from before the binary format into a SavedState."""
+        game_state = json.loads(serialized_state)
+        board = Board()
+        board.grid = game_state['board']
+        return savestate.SavedState(
+            board.cells, board.palette,
+            Block.from_dict(game_state['current_block']),
+            Block.from_dict(game_state['next_block']),
+            game_state['score'],
+            game_state['level'],
+            game_state['lines_cleared'],
+            game_state['fall_speed'],
+            game_state['fall_time'],
+            game_state['game_over'],
+            game_state['paused'],
+            game_state.get('score_saved', False),  # For compatibility with older saves
+        )
+
+    def restore_state(self, state):
+        """Apply a decoded savestate.SavedState to this game."""
+        # A replay only covers games that started from their seed
+        self.recorder = None
+        self.board.load_cells(state.cells, state.palette)
+        self.current_block = state.current_block
+        self.next_block = state.next_block
+        self.score = state.score
+        self.level = state.level
+        self.lines_cleared = state.lines_cleared
+        self.fall_speed = state.fall_speed
+        # self.player_name is already correct as it's used for loading
+        self.game_over = state.game_over
+        self.paused = state.paused
+        self.fall_time = state.fall_time
+        self.score_saved = state.score_saved
+
+        # Ensure sound state is consistent with loaded game state
+        if self.paused:
+            self.sound.stop_background_music()
+        else:
+            self.sound.start_background_music()
+
+        # Reset fall_time to avoid immediate drop after loading if game was paused a long time
+        if not self.game_over and not self.paused:
+            self.fall_time = self.clock()
@@ -0,0 +1,130 @@
+"""Seeded piece generators ("randomizers") for Engine.
+
+Each source owns a random.Random, pre-generates pieces (indices into
+Block.SHAPES) in chunks into an array, and can preview any number of
+upcoming pieces without consuming them, so search agents can look ahead
+without copying generator state.
+"""
+import random
+from array import array
+
+PIECE_COUNT = 7
+I, T, J, L, O, S, Z = range(PIECE_COUNT)
+
+_TOP_3_BITS = bytes(byte >> 5 for byte in range(256))
+
+
+class PieceSource:
+    """Base class for randomizers; subclasses implement _generate."""
+
+    name = None
+
+    def __init__(self, seed=None, chunk_size=256):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.chunk_size = chunk_size
+        self.buffer = array('B')
+        self.position = 0
+
+    def _generate(self, count):
+        """Return about count new pieces (bytes or a list), continuing the sequence."""
+        raise NotImplementedError
+
+    def _ensure(self, count):
+        """Make sure count pieces are buffered past the current position."""
+        if len(self.buffer) - self.position >= count:
+            return
+        del self.buffer[:self.position]
+        self.position = 0
+        while len(self.buffer) < count:
+            self.buffer.frombytes(bytes(self._generate(max(self.chunk_size, count - len(self.buffer)))))
+
+    def next(self):
+        """Take the next piece."""
+        if self.position >= len(self.buffer):
+            self._ensure(1)
+        piece = self.buffer[self.position]
+        self.position += 1
+        return piece
+
+    def preview(self, count):
+        """Return the next count pieces without taking them."""
+        self._ensure(count)
+        return self.buffer[self.position:self.position + count].tolist()
+
+
+class UniformSource(PieceSource):
+    """Every piece is drawn independently; same sequence as Block.random with the same seed."""
+
+    name = 'uniform'
+
+    def _generate(self, count):
+        # randrange(7) takes the top 3 bits of one 32-bit Mersenne Twister word
+        # per attempt and rejects 7; getrandbits(32 * n) returns the next n
+        # words in order, so this is the randrange(7) sequence without a call
+        # per piece.
+        words = self.rng.getrandbits(32 * count).to_bytes(4 * count, 'little')
+        return words[3::4].translate(_TOP_3_BITS).replace(b'\x07', b'')
+
+
+class BagSource(PieceSource):
+    """7-bag: each run of seven pieces is a shuffled set of all seven."""
+
+    name = '7bag'
+
+    def _generate(self, count):
+        pieces = []
+        bag = list(range(PIECE_COUNT))
+        shuffle = self.rng.shuffle
+        for _ in range(-(-count // PIECE_COUNT)):
+            shuffle(bag)
+            pieces.extend(bag)
+        return pieces
+
+
+class HistorySource(PieceSource):
+    """TGM-style: reroll (up to rolls times) any piece among the last history_size pieces.
+
+    The history starts as Z, Z, S, S and the first piece is never S, Z or O,
+    as in The Grand Master.
+    """
+
+    name = 'tgm'
+
+    def __init__(self, seed=None, chunk_size=256, history_size=4, rolls=6):
+        super().__init__(seed, chunk_size)
+        self.rolls = rolls
+        self.history = [Z, Z, S, S][:history_size]
+        self.first = True
+
+    def _generate(self, count):
+        randrange = self.rng.randrange
+        history = self.history
+        pieces = []
+        if self.first:
+            self.first = False
+            piece = (I, T, J, L)[randrange(4)]
+            pieces.append(piece)
+            history.pop(0)
+            history.append(piece)
+        while len(pieces) < count:
+            for _ in range(self.rolls):
+                piece = randrange(PIECE_COUNT)
+                if piece not in history:
+                    break
+            pieces.append(piece)
+            history.pop(0)
+            history.append(piece)
+        return pieces
+
+
+RANDOMIZERS = {source.name: source for source in (UniformSource, BagSource, HistorySource)}
+
+
+def make_source(name, seed=None):
+    """Create the randomizer registered under name."""
+    try:
+        source = RANDOMIZERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown randomizer '{name}' (choose from {', '.join(RANDOMIZERS)})") from None
+    return source(seed)
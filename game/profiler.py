@@ -0,0 +1,83 @@
+"""Per-frame timing of the main loop's phases.
+
+The loop calls lap(phase) after each piece of work, which charges the time
+since the previous lap to that phase, and end_frame() once the frame is on
+screen. Each phase keeps the last window frames, from which percentiles are
+read for the overlay, and every frame can be streamed to a CSV file. While
+disabled, lap() and end_frame() return straight away.
+"""
+import csv
+import time
+from collections import deque
+
+PHASES = ('events', 'update', 'board', 'hud', 'db', 'flip')
+
+
+class FrameProfiler:
+    def __init__(self, enabled=False, window=600, csv_path=None, clock=time.perf_counter):
+        self.enabled = enabled
+        self.clock = clock
+        self.samples = {phase: deque(maxlen=window) for phase in PHASES + ('total',)}
+        self.frames = 0
+        self._current = dict.fromkeys(PHASES, 0.0)
+        self._last = clock()
+        self._started = self._last
+        self._csv_file = None
+        self._csv = None
+        if csv_path:
+            self.stream_to(csv_path)
+
+    def stream_to(self, path):
+        """Write one row per profiled frame to a CSV file at path (times in ms)."""
+        self.close()
+        self._csv_file = open(path, 'w', newline='')
+        self._csv = csv.writer(self._csv_file)
+        self._csv.writerow(('frame', 'time_ms') + PHASES + ('total',))
+
+    def begin_frame(self):
+        """Start timing a new frame, dropping anything lapped since the last one ended."""
+        if not self.enabled:
+            return
+        for phase in PHASES:
+            self._current[phase] = 0.0
+        self._last = self.clock()
+
+    def lap(self, phase):
+        """Charge the time since the previous lap (or the start of the frame) to phase."""
+        if not self.enabled:
+            return
+        now = self.clock()
+        self._current[phase] += now - self._last
+        self._last = now
+
+    def end_frame(self):
+        """Record the frame's phase times."""
+        if not self.enabled:
+            return
+        self.frames += 1
+        row = [self._current[phase] * 1000 for phase in PHASES]
+        total = sum(row)
+        for phase, ms in zip(PHASES, row):
+            self.samples[phase].append(ms)
+        self.samples['total'].append(total)
+        if self._csv is not None:
+            self._csv.writerow([self.frames, round((self._last - self._started) * 1000, 3)]
+                               + [round(ms, 4) for ms in row] + [round(total, 4)])
+
+    def percentiles(self, phase, points=(50, 95, 99)):
+        """Return the given percentiles (nearest rank, in ms) of phase over the window."""
+        ordered = sorted(self.samples[phase])
+        if not ordered:
+            return tuple(0.0 for _ in points)
+        last = len(ordered) - 1
+        return tuple(ordered[min(last, max(0, -(-point * len(ordered) // 100) - 1))] for point in points)
+
+    def summary(self):
+        """Return (phase, p50, p95, p99) for every phase and the frame total."""
+        return [(phase,) + self.percentiles(phase) for phase in PHASES + ('total',)]
+
+    def close(self):
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+            self._csv = None
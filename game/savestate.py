@@ -0,0 +1,204 @@
+"""Versioned binary encoding of an Engine's saveable state.
+
+Layout (little endian):
+
+    header  magic b'TS', format version, flags (bit 0: body is zlib-compressed)
+    body    score, lines_cleared, level, fall_speed, fall_time, state bits
+            (game_over, paused, score_saved), current and next block as
+            (piece, rotation, x, y), then the number of extra colours
+            extra colours as RGB triples
+            the board, two cells per byte (low nibble first), each cell a
+            palette index: 0 = empty, 1..7 = Block.COLORS, 8..15 = extra colours
+
+A delta (flags bit 1) replaces the board with a uint32 mask of the rows that
+differ from a keyframe, followed by those rows only (WIDTH / 2 bytes each);
+it is decoded on top of the keyframe's SavedState.
+
+Saves written before this format are JSON text; is_binary tells them apart.
+"""
+import struct
+import zlib
+from collections import namedtuple
+
+from .components.block import Block
+from .components.board import Board
+
+MAGIC = b'TS'
+VERSION = 1
+FLAG_ZLIB = 1
+FLAG_DELTA = 2
+
+_HEADER = struct.Struct('<2sBB')
+_BODY = struct.Struct('<qIHddB4b4bB')
+_CELL_BYTES = Board.WIDTH * Board.HEIGHT // 2
+_ROW_BYTES = Board.WIDTH // 2
+_LOW_NIBBLES = int.from_bytes(b'\x0f' * _CELL_BYTES, 'little')
+_ROW_MASK = struct.Struct('<I')
+
+_GAME_OVER, _PAUSED, _SCORE_SAVED = 1, 2, 4
+
+# Decoded save: cells is a bytearray of palette indices into palette (index 0 is None)
+SavedState = namedtuple('SavedState', [
+    'cells', 'palette', 'current_block', 'next_block', 'score', 'level',
+    'lines_cleared', 'fall_speed', 'fall_time', 'game_over', 'paused', 'score_saved',
+])
+
+
+class SaveStateError(ValueError):
+    """Raised for data that is not a save state this version can read."""
+
+
+def is_binary(data):
+    """True if data is a binary save (as opposed to a legacy JSON one)."""
+    return isinstance(data, (bytes, bytearray, memoryview)) and bytes(data[:2]) == MAGIC
+
+
+def encode(engine, compress=False):
+    """Encode an engine's board, blocks and scalars; the blocks must not be None."""
+    body, cells = _encode_scalars(engine)
+    return _finish(body + _pack_cells(cells), 0, compress)
+
+
+def encode_delta(engine, base_cells, compress=False):
+    """Encode like encode(), but store only the board rows that differ from base_cells.
+
+    base_cells are the keyframe's board cells; the engine's palette must
+    extend the keyframe's, since unchanged rows keep the keyframe's indices.
+    """
+    if len(engine.board.palette) > 16:
+        raise SaveStateError("a delta cannot remap colours; write a keyframe")
+    body, cells = _encode_scalars(engine)
+    width = Board.WIDTH
+    changed = 0
+    rows = []
+    for row in range(Board.HEIGHT):
+        start = row * width
+        cells_in_row = cells[start:start + width]
+        if cells_in_row != base_cells[start:start + width]:
+            changed |= 1 << row
+            rows.append(_pack_cells(cells_in_row))
+    return _finish(body + _ROW_MASK.pack(changed) + b''.join(rows), FLAG_DELTA, compress)
+
+
+def _encode_scalars(engine):
+    """Return (struct body with extra colours, cells as nibble-sized palette indices)."""
+    board = engine.board
+    cells = board.cells
+    palette = board.palette
+    base = len(Block.COLORS) + 1
+    if len(palette) > 16:
+        # More colours than fit in a nibble were registered; keep the ones in use
+        used = sorted(set(cells) - set(range(base)))
+        if len(used) > 16 - base:
+            raise SaveStateError("too many distinct colours on the board")
+        table = bytearray(range(256))
+        for i, index in enumerate(used, base):
+            table[index] = i
+        cells = cells.translate(table)
+        extras = [palette[index] for index in used]
+    else:
+        extras = palette[base:]
+
+    current, upcoming = engine.current_block, engine.next_block
+    bits = (_GAME_OVER if engine.game_over else 0) | (_PAUSED if engine.paused else 0) \
+        | (_SCORE_SAVED if engine.score_saved else 0)
+    body = [_BODY.pack(engine.score, engine.lines_cleared, engine.level, engine.fall_speed,
+                       engine.fall_time, bits,
+                       current.piece, current.rotation, current.x, current.y,
+                       upcoming.piece, upcoming.rotation, upcoming.x, upcoming.y,
+                       len(extras))]
+    body.extend(bytes(color) for color in extras)
+    return b''.join(body), cells
+
+
+def _pack_cells(cells):
+    size = len(cells) // 2
+    packed = int.from_bytes(cells[0::2], 'little') | int.from_bytes(cells[1::2], 'little') << 4
+    return packed.to_bytes(size, 'little')
+
+
+def _unpack_cells(packed, cells, start=0):
+    """Unpack nibble pairs from packed into cells, starting at cell index start."""
+    size = len(packed)
+    low_nibbles = _LOW_NIBBLES & ((1 << 8 * size) - 1)
+    packed = int.from_bytes(packed, 'little')
+    cells[start:start + 2 * size:2] = (packed & low_nibbles).to_bytes(size, 'little')
+    cells[start + 1:start + 2 * size:2] = (packed >> 4 & low_nibbles).to_bytes(size, 'little')
+
+
+def _finish(body, flags, compress):
+    if compress:
+        body = zlib.compress(body)
+        flags |= FLAG_ZLIB
+    return _HEADER.pack(MAGIC, VERSION, flags) + body
+
+
+def is_delta(data):
+    """True if data is a binary delta that needs its keyframe to decode."""
+    return is_binary(data) and len(data) >= _HEADER.size and bool(data[3] & FLAG_DELTA)
+
+
+def decode(data, base=None):
+    """Decode a binary save into a SavedState; a delta also needs its keyframe's SavedState as base."""
+    data = bytes(data)
+    try:
+        magic, version, flags = _HEADER.unpack_from(data)
+    except struct.error:
+        raise SaveStateError("truncated save state header") from None
+    if magic != MAGIC:
+        raise SaveStateError("not a binary save state")
+    if version > VERSION:
+        raise SaveStateError(f"save state version {version} is newer than supported ({VERSION})")
+    body = data[_HEADER.size:]
+    if flags & FLAG_ZLIB:
+        try:
+            body = zlib.decompress(body)
+        except zlib.error as e:
+            raise SaveStateError(f"corrupt compressed save state: {e}") from None
+
+    try:
+        (score, lines_cleared, level, fall_speed, fall_time, bits,
+         piece, rotation, x, y, next_piece, next_rotation, next_x, next_y,
+         extra_count) = _BODY.unpack_from(body)
+    except struct.error:
+        raise SaveStateError("truncated save state") from None
+    offset = _BODY.size
+    palette = [None] + list(Block.COLORS)
+    for _ in range(extra_count):
+        palette.append(tuple(body[offset:offset + 3]))
+        offset += 3
+    if piece >= len(Block.ROTATIONS) or next_piece >= len(Block.ROTATIONS):
+        raise SaveStateError("unknown piece in save state")
+
+    if flags & FLAG_DELTA:
+        if base is None:
+            raise SaveStateError("a delta save state needs its keyframe")
+        cells = bytearray(base.cells)
+        try:
+            changed, = _ROW_MASK.unpack_from(body, offset)
+        except struct.error:
+            raise SaveStateError("truncated save state board") from None
+        offset += _ROW_MASK.size
+        for row in range(Board.HEIGHT):
+            if changed >> row & 1:
+                packed = body[offset:offset + _ROW_BYTES]
+                if len(packed) != _ROW_BYTES:
+                    raise SaveStateError("truncated save state board")
+                _unpack_cells(packed, cells, row * Board.WIDTH)
+                offset += _ROW_BYTES
+    else:
+        packed = body[offset:offset + _CELL_BYTES]
+        if len(packed) != _CELL_BYTES:
+            raise SaveStateError("truncated save state board")
+        cells = bytearray(Board.WIDTH * Board.HEIGHT)
+        _unpack_cells(packed, cells)
+    if max(cells) >= len(palette):
+        raise SaveStateError("board refers to a colour that was not saved")
+
+    return SavedState(
+        cells, palette,
+        Block.from_piece(piece, rotation % 4, x, y),
+        Block.from_piece(next_piece, next_rotation % 4, next_x, next_y),
+        score, level, lines_cleared, fall_speed, fall_time,
+        bool(bits & _GAME_OVER), bool(bits & _PAUSED), bool(bits & _SCORE_SAVED),
+    )
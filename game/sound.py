@@ -1,15 +1,98 @@
+import os
+import threading
+
 import pygame
 
-class Sound:
-    def __init__(self):
-        pygame.mixer.init()
-        self.rotate_sound = pygame.mixer.Sound("assets/rotate.mp3")
-        self.clear_sound = pygame.mixer.Sound("assets/clear.mp3")
-        self.drop_sound = pygame.mixer.Sound("assets/drop.mp3")
-        self.game_over_sound = pygame.mixer.Sound("assets/gameover.mp3")
+from .engine import NullSound
+
+EFFECTS = {
+    'rotate': "assets/rotate.mp3",
+    'clear': "assets/clear.mp3",
+    'drop': "assets/drop.mp3",
+    'game_over': "assets/gameover.mp3",
+}
+MUSIC = "assets/background.mp3"
+
+
+class AudioCache:
+    """Opens the mixer, decodes the sound effects and loads the music, once per process.
+
+    preload() does the work in a background thread so startup does not wait
+    for it; wait() blocks until it is done. available is False when no audio
+    device could be opened (or SDL was told to use a null driver), and nothing
+    is loaded in that case.
+    """
+
+    null_drivers = ('dummy',)  # SDL_AUDIODRIVER values that mean "no audio"
+
+    def __init__(self, effects=EFFECTS, music=MUSIC):
+        self.paths = dict(effects)
+        self.music = music
+        self.effects = {}
+        self.available = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._loaded = threading.Event()
+
+    def preload(self):
+        """Start loading in a background thread, if not already started."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._load, name="audio-cache", daemon=True)
+                self._thread.start()
+        return self
+
+    def _load(self):
+        if os.environ.get('SDL_AUDIODRIVER') in self.null_drivers:
+            self.available = False
+            self._loaded.set()
+            return
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+            self.effects = {name: pygame.mixer.Sound(path) for name, path in self.paths.items()}
+            pygame.mixer.music.load(self.music)
+            pygame.mixer.music.set_volume(0.5)
+            self.available = True
+        except (pygame.error, OSError) as e:
+            print(f"Audio disabled: {e}")
+            self.effects = {}
+            self.available = False
+        finally:
+            self._loaded.set()
 
-        pygame.mixer.music.load("assets/background.mp3")
-        pygame.mixer.music.set_volume(0.5)
+    def wait(self):
+        """Load (or finish loading) the assets; returns whether audio is available."""
+        self.preload()
+        self._loaded.wait()
+        return self.available
+
+
+_shared = None
+
+
+def shared_audio():
+    """Return the process-wide audio cache (call preload() on it early to load in the background)."""
+    global _shared
+    if _shared is None:
+        _shared = AudioCache()
+    return _shared
+
+
+def create_sound(cache=None):
+    """Return a Sound using the shared cache, or a NullSound when there is no audio device."""
+    cache = cache or shared_audio()
+    return Sound(cache) if cache.wait() else NullSound()
+
+
+class Sound:
+    def __init__(self, cache=None):
+        cache = cache or shared_audio()
+        cache.wait()
+        self.rotate_sound = cache.effects['rotate']
+        self.clear_sound = cache.effects['clear']
+        self.drop_sound = cache.effects['drop']
+        self.game_over_sound = cache.effects['game_over']
 
         # Sound state
         self.muted = False
@@ -50,4 +133,4 @@ class Sound:
         else:
             # Restore volume
             pygame.mixer.music.set_volume(self.music_volume)
-        return self.muted
\ No newline at end of file
+        return self.muted
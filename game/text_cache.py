@@ -0,0 +1,46 @@
+from collections import OrderedDict, namedtuple
+
+# Same fields as functools.lru_cache's cache_info()
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class TextCache:
+    """Bounded LRU cache of rendered text surfaces keyed by (font, text, colour).
+
+    Rendered surfaces are shared between callers, so they must be blitted and
+    never drawn on.
+    """
+
+    def __init__(self, maxsize=256, antialias=True):
+        self.maxsize = maxsize
+        self.antialias = antialias
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+
+    def render(self, font, text, color):
+        """Return the surface for text in font and colour, rendering it on a miss."""
+        key = (font, text, tuple(color))
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = font.render(text, self.antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.maxsize:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._surfaces))
+
+    def clear(self):
+        """Drop every cached surface and reset the counters."""
+        self._surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._surfaces)
@@ -0,0 +1,29 @@
+class FixedTimestep:
+    """Turns elapsed real time into a whole number of fixed simulation steps.
+
+    Time left over from one frame is carried in the accumulator to the next,
+    so the simulation runs at hz on average whatever the render rate. At most
+    max_steps run per frame; a larger backlog is caught up over the following
+    frames (behind is True meanwhile, so rendering can be skipped), and
+    anything beyond max_backlog_ms, e.g. after the window was dragged, is
+    dropped rather than replayed in a burst.
+    """
+
+    def __init__(self, hz=60, max_steps=5, max_backlog_ms=250):
+        self.step_ms = 1000 / hz
+        self.max_steps = max_steps
+        self.max_backlog_ms = max_backlog_ms
+        self.accumulator = 0.0
+        self.behind = False
+
+    def advance(self, elapsed_ms):
+        """Add elapsed_ms of real time; returns how many steps to simulate now."""
+        self.accumulator = min(self.accumulator + elapsed_ms, self.max_backlog_ms)
+        steps = min(int(self.accumulator // self.step_ms), self.max_steps)
+        self.accumulator -= steps * self.step_ms
+        self.behind = self.accumulator >= self.step_ms
+        return steps
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.behind = False
@@ -0,0 +1,148 @@
+import numpy as np
+
+from .components.block import Block
+from .components.board import Board
+
+# Lookup tables built from Block.ROTATIONS. A placement is indexed by
+# (piece * 4 + rotation) * WIDTH + x; PLACEMENT_MASKS[:, index] holds the
+# piece's row masks already shifted to column x, padded to 4 rows with zeros
+# so that every piece can be handled with the same array shapes.
+PIECE_COUNT = len(Block.ROTATIONS)
+PLACEMENT_MASKS = np.zeros((4, PIECE_COUNT * 4 * Board.WIDTH), dtype=np.uint16)
+PIECE_WIDTHS = np.zeros(PIECE_COUNT * 4, dtype=np.int64)
+for _piece, _states in enumerate(Block.ROTATIONS):
+    for _rotation, _state in enumerate(_states):
+        PIECE_WIDTHS[_piece * 4 + _rotation] = _state.width
+        for _x in range(Board.WIDTH - _state.width + 1):
+            for _dy, _mask in enumerate(_state.row_masks):
+                PLACEMENT_MASKS[_dy, (_piece * 4 + _rotation) * Board.WIDTH + _x] = _mask << _x
+IN_BOUNDS = (PLACEMENT_MASKS[0] != 0).reshape(PIECE_COUNT, 4 * Board.WIDTH)
+SPAWN_X = Board.WIDTH // 2 - PIECE_WIDTHS[::4] // 2
+SPAWN_INDEX = np.arange(PIECE_COUNT) * 4 * Board.WIDTH + SPAWN_X
+SCORE_TABLE = np.array([0, 40, 100, 300, 1200], dtype=np.int64)
+
+
+def clear_full_rows(board):
+    """Remove full rows in place from a (HEIGHT, N) array of row masks; returns lines cleared per column."""
+    full = board == Board.FULL_ROW
+    cleared = full.sum(axis=0)
+    clearing = np.nonzero(cleared)[0]
+    if clearing.size:
+        # Stable sort puts full rows on top (then blanked) and keeps the order of the rest
+        order = np.argsort(~full[:, clearing], axis=0, kind='stable')
+        compacted = np.take_along_axis(board[:, clearing], order, axis=0)
+        compacted[np.arange(board.shape[0])[:, None] < cleared[clearing]] = 0
+        board[:, clearing] = compacted
+    return cleared
+
+
+class VectorEngine:
+    """Steps many boards in lockstep with NumPy, one placement per board per call.
+
+    Each board is HEIGHT row bitmasks (bit x = column x), the same layout as
+    Board.rows. Scoring and levels follow Engine.update_score, pieces spawn like
+    Engine.generate_new_block and a board whose next piece cannot spawn is game
+    over. An illegal placement (off the board, or no room at the top) also ends
+    that board's game; use legal_mask() to pick placements.
+    """
+
+    def __init__(self, batch_size, seed=None):
+        self.batch_size = batch_size
+        self.rng = np.random.default_rng(seed)
+        # Rows are stored (HEIGHT + 4, B) so each row of every board is contiguous.
+        # The 4 extra rows below the floor are full, which turns the floor into
+        # an ordinary collision.
+        self._rows = np.zeros((Board.HEIGHT + 4, batch_size), dtype=np.uint16)
+        self._rows[Board.HEIGHT:] = Board.FULL_ROW
+        self.pieces = np.zeros(batch_size, dtype=np.int64)
+        self.next_pieces = np.zeros(batch_size, dtype=np.int64)
+        self.score = np.zeros(batch_size, dtype=np.int64)
+        self.level = np.ones(batch_size, dtype=np.int64)
+        self.lines_cleared = np.zeros(batch_size, dtype=np.int64)
+        self.pieces_placed = np.zeros(batch_size, dtype=np.int64)
+        self.game_over = np.zeros(batch_size, dtype=bool)
+        self.reset()
+
+    @property
+    def rows(self):
+        """(B, HEIGHT) view of the row bitmasks."""
+        return self._rows[:Board.HEIGHT].T
+
+    def reset(self, mask=None):
+        """Start new games on every board, or only where mask is True."""
+        if mask is None:
+            mask = np.ones(self.batch_size, dtype=bool)
+        count = int(mask.sum())
+        if not count:
+            return
+        self._rows[:Board.HEIGHT, mask] = 0
+        self.pieces[mask] = self.rng.integers(0, PIECE_COUNT, count)
+        self.next_pieces[mask] = self.rng.integers(0, PIECE_COUNT, count)
+        self.score[mask] = 0
+        self.level[mask] = 1
+        self.lines_cleared[mask] = 0
+        self.pieces_placed[mask] = 0
+        self.game_over[mask] = False
+
+    def boards(self):
+        """Return the boards as a (B, HEIGHT, WIDTH) uint8 occupancy array."""
+        columns = np.arange(Board.WIDTH, dtype=np.uint16)
+        return ((self.rows[:, :, None] >> columns) & 1).astype(np.uint8)
+
+    def legal_mask(self):
+        """Return a (B, 4, WIDTH) bool array of legal (rotation, x) placements."""
+        legal = IN_BOUNDS[self.pieces] & ~self.game_over[:, None]
+        # Only boards with something in the top 4 rows can block a placement
+        crowded = np.nonzero((self._rows[:4] != 0).any(axis=0))[0]
+        if crowded.size:
+            indices = self.pieces[crowded, None] * 4 * Board.WIDTH + np.arange(4 * Board.WIDTH)
+            masks = PLACEMENT_MASKS[:, indices]  # (4, crowded, 4 * WIDTH)
+            top = self._rows[:4, crowded, None]
+            overlap = (masks[0] & top[0]) | (masks[1] & top[1]) | (masks[2] & top[2]) | (masks[3] & top[3])
+            legal[crowded] &= overlap == 0
+        return legal.reshape(self.batch_size, 4, Board.WIDTH)
+
+    def step(self, rotations, xs):
+        """Hard-drop each board's current piece at (rotation, x).
+
+        Returns (lines_cleared, game_over) arrays for this step. Boards that are
+        already game over are left untouched.
+        """
+        height = Board.HEIGHT
+        rows = self._rows
+        batch = np.arange(self.batch_size)
+        xs = np.asarray(xs, dtype=np.int64)
+        shapes = self.pieces * 4 + np.asarray(rotations, dtype=np.int64) % 4
+
+        active = ~self.game_over
+        legal = active & (xs >= 0) & (xs + PIECE_WIDTHS[shapes] <= Board.WIDTH)
+        masks = PLACEMENT_MASKS[:, shapes * Board.WIDTH + np.clip(xs, 0, Board.WIDTH - 1)]
+        masks *= legal
+
+        # Drop: the first height at which the piece overlaps anything, minus one
+        overlap = rows[:height + 1] & masks[0]
+        for r in range(1, 4):
+            overlap |= rows[r:r + height + 1] & masks[r]
+        landing = (overlap != 0).argmax(axis=0) - 1
+        legal &= landing >= 0
+        masks *= legal
+        landing = np.maximum(landing, 0)
+        for r in range(4):
+            rows[landing + r, batch] |= masks[r]
+
+        cleared = clear_full_rows(rows[:height])
+
+        self.score += SCORE_TABLE[cleared] * self.level
+        self.lines_cleared += cleared
+        self.level = np.minimum(20, 1 + self.lines_cleared // 10)
+        self.pieces_placed += legal
+
+        # Spawn the next piece; a board whose spawn position is blocked is over
+        self.pieces = np.where(legal, self.next_pieces, self.pieces)
+        new_next = self.rng.integers(0, PIECE_COUNT, self.batch_size)
+        self.next_pieces = np.where(legal, new_next, self.next_pieces)
+        spawn = PLACEMENT_MASKS[:, SPAWN_INDEX[self.pieces]]
+        blocked = ((rows[:4] & spawn) != 0).any(axis=0)
+        self.game_over |= active & (~legal | blocked)
+
+        return cleared, self.game_over.copy()
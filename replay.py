@@ -0,0 +1,126 @@
+"""List, re-simulate or watch recorded games.
+
+Examples:
+    python replay.py --list
+    python replay.py 42 --headless
+    python replay.py 42 --speed 8
+
+Games played in tetris.py are recorded as a seed plus an action log when
+they end. --headless re-simulates one without a display as fast as
+possible; otherwise it is rendered at --speed times real time.
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from game import replay
+from game.database import TetrisDatabase
+from game.engine import Engine
+
+SPEEDS = (1, 2, 8)
+FPS = 60
+
+
+def simulate(seed, events, repeat=1, randomizer="uniform"):
+    """Re-simulate a replay repeat times; returns (final engine, best seconds per run)."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        engine = Engine.from_replay(seed, events, randomizer)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return engine, best
+
+
+def watch(player_name, seed, events, speed, randomizer="uniform"):
+    """Render a replay at speed times real time until it ends or the window is closed."""
+    # Loaded here so listing and headless re-simulation never load pygame
+    import pygame
+    from game.game import Game
+
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    pygame.display.set_caption(f"Tetris replay ({speed}x)")
+    font = pygame.font.Font(None, 36)
+    db = TetrisDatabase(":memory:")
+    game = Game(screen, player_name, db_instance=db, randomizer=randomizer)
+    game.autosaver = None
+    game.recording = False
+    game.reset(seed)
+    playback = replay.Playback(game, events, speed)
+
+    clock = pygame.time.Clock()
+    start = pygame.time.get_ticks()
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_q):
+                running = False
+        playback.advance(pygame.time.get_ticks() - start)
+        if game.clearing_animation:
+            game.board.update_clearing_animation()
+            if game.board.is_animation_complete():
+                game.finish_line_clear()
+
+        screen.fill((0, 0, 0))
+        game.draw()
+        for i, text in enumerate((f"Replay {speed}x", f"Score: {game.score}",
+                                  f"Level: {game.level}", f"Lines: {game.lines_cleared}")):
+            screen.blit(font.render(text, True, (255, 255, 255)), (330, 30 + 40 * i))
+        if playback.done and not game.clearing_animation:
+            screen.blit(font.render("End of replay (Q to quit)", True, (255, 255, 0)), (330, 220))
+        pygame.display.flip()
+        clock.tick(FPS)
+    game.sound.stop_background_music()
+    pygame.quit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List, re-simulate or watch recorded Tetris games.")
+    parser.add_argument("replay_id", type=int, nargs="?", help="replay to play (see --list)")
+    parser.add_argument("--list", action="store_true", help="list the most recent replays")
+    parser.add_argument("--headless", action="store_true", help="re-simulate without a display and report")
+    parser.add_argument("--repeat", type=int, default=1, help="headless runs to time (default: 1)")
+    parser.add_argument("--speed", type=int, choices=SPEEDS, default=1, help="playback speed (default: 1)")
+    parser.add_argument("--db", default="tetris_scores.db", help="score database the replays are in")
+    args = parser.parse_args(argv)
+
+    db = TetrisDatabase(args.db)
+    try:
+        if args.list or args.replay_id is None:
+            print(f"{'id':>6} {'player':<16} {'score':>8} {'level':>5} {'lines':>5} {'length':>8}  date")
+            for replay_id, name, score, level, lines, duration, date_time in db.get_replays():
+                print(f"{replay_id:>6} {name:<16} {score:>8} {level:>5} {lines:>5} {duration / 1000:>7.1f}s  {date_time}")
+            return 0
+
+        row = db.load_replay(args.replay_id)
+    finally:
+        db.close()
+    if row is None:
+        print(f"No replay with id {args.replay_id}")
+        return 1
+    player_name, seed, actions, randomizer = row
+    try:
+        events = replay.decode(actions)
+    except replay.ReplayError as e:
+        print(f"Error decoding replay: {e}")
+        return 1
+
+    if args.headless:
+        engine, seconds = simulate(seed, events, args.repeat, randomizer)
+        duration = events[-1].time_ms / 1000 if events else 0
+        print(f"Replay {args.replay_id} ({player_name}): {len(events)} actions, "
+              f"score {engine.score}, level {engine.level}, lines {engine.lines_cleared}, "
+              f"game over: {engine.game_over}")
+        print(f"Re-simulated {duration:.1f}s of play in {seconds * 1000:.2f} ms "
+              f"({duration / seconds if seconds else float('inf'):.0f}x real time)")
+    else:
+        watch(player_name, seed, events, args.speed, randomizer)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+import random
+import unittest
+
+import numpy as np
+
+from game.ai import AIPlayer, PIECE_SLOTS, batch_features, evaluate, expand, features, placements
+from game.components.board import Board
+from game.engine import Engine
+
+
+def random_rows(rng, fill):
+    """Rows with a random ragged stack of the given height and a few holes."""
+    rows = [0] * Board.HEIGHT
+    for y in range(Board.HEIGHT - fill, Board.HEIGHT):
+        rows[y] = rng.getrandbits(Board.WIDTH) & (Board.FULL_ROW >> 1)
+    return rows
+
+
+class TestFeatures(unittest.TestCase):
+    def test_features_of_a_known_board(self):
+        """Heights, holes, bumpiness and wells on a small hand-built stack."""
+        rows = [0] * Board.HEIGHT
+        rows[Board.HEIGHT - 3] = 0b0000000001   # column 0 is 3 high
+        rows[Board.HEIGHT - 2] = 0b0000000010   # column 1 is 2 high, over a hole
+        rows[Board.HEIGHT - 1] = 0b0000000001
+        aggregate_height, holes, bumpiness, wells = features(rows)
+        self.assertEqual(aggregate_height, 5)
+        self.assertEqual(holes, 2)
+        self.assertEqual(bumpiness, 1 + 2)
+        # Columns 2..9 are flat at 0, so nothing sits below both neighbours
+        self.assertEqual(wells, 0)
+
+    def test_batch_features_match_pure_python(self):
+        """The NumPy features agree with features() on random boards."""
+        rng = random.Random(0)
+        boards = [random_rows(rng, rng.randint(0, 12)) for _ in range(50)]
+        cells = np.array([sum(bin(row).count('1') for row in rows) for rows in boards])
+        batched = batch_features(np.array(boards, dtype=np.uint16).T, cells)
+        for i, rows in enumerate(boards):
+            self.assertEqual(tuple(int(values[i]) for values in batched), features(rows))
+
+
+class TestPlacements(unittest.TestCase):
+    def assert_expand_matches_placements(self, rows, piece):
+        expected = {(p.rotation, p.x): p for p in placements(rows, piece)}
+        boards, landing, lines, legal = expand(np.array(rows, dtype=np.uint16)[:, None], piece)
+        found = 0
+        for i, slot in enumerate(PIECE_SLOTS[piece]):
+            if not legal[i]:
+                continue
+            found += 1
+            placement = expected[divmod(int(slot), Board.WIDTH)]
+            self.assertEqual(landing[i], placement.y)
+            self.assertEqual(lines[i], placement.lines)
+            self.assertEqual(boards[:, i].tolist(), placement.rows)
+        self.assertEqual(found, len(expected))
+
+    def test_expand_matches_placements(self):
+        """Every legal batched placement matches the pure-Python drop."""
+        rng = random.Random(1)
+        for piece in range(len(PIECE_SLOTS)):
+            self.assert_expand_matches_placements(random_rows(rng, 6), piece)
+
+    def test_expand_matches_placements_on_the_floor(self):
+        """Pieces landing on the floor keep their bottom row, and complete bottom rows clear."""
+        empty = [0] * Board.HEIGHT
+        gap = [0] * (Board.HEIGHT - 1) + [0b1111110000]      # I at x=0 completes it
+        well = [0] * (Board.HEIGHT - 2) + [0b0111111111] * 2  # Filled by anything reaching column 9
+        for piece in range(len(PIECE_SLOTS)):
+            for rows in (empty, gap, well):
+                self.assert_expand_matches_placements(rows, piece)
+        _, _, lines, _ = expand(np.array(gap, dtype=np.uint16)[:, None], 0)
+        self.assertEqual(lines[list(PIECE_SLOTS[0]).index(0)], 1)
+
+    def test_o_piece_has_one_rotation(self):
+        """Duplicate rotations are not searched twice."""
+        rows = [0] * Board.HEIGHT
+        self.assertEqual(len(placements(rows, 4)), Board.WIDTH - 1)
+
+
+class TestAIPlayer(unittest.TestCase):
+    def test_score_matches_evaluate(self):
+        """The batched score is evaluate() applied to each board."""
+        rng = random.Random(2)
+        player = AIPlayer(weights={'holes': -0.6})
+        boards = [random_rows(rng, rng.randint(0, 12)) for _ in range(20)]
+        lines = np.array([rng.randint(0, 4) for _ in boards])
+        cells = np.array([sum(bin(row).count('1') for row in rows) for rows in boards])
+        scores = player.score(np.array(boards, dtype=np.uint16).T, lines, cells)
+        for rows, line_count, score in zip(boards, lines, scores):
+            self.assertAlmostEqual(score, evaluate(rows, int(line_count), player.weights))
+
+    def test_bot_clears_lines(self):
+        """The lookahead bot keeps a seeded game going and clears lines."""
+        engine = Engine(seed=0)
+        ai = AIPlayer()
+        while not engine.game_over and engine.pieces_placed < 200:
+            self.assertIsNotNone(ai.play(engine))
+        self.assertFalse(engine.game_over)
+        self.assertGreater(engine.lines_cleared, 50)
+
+    def test_no_move_once_game_is_over(self):
+        """choose() returns None for a finished game."""
+        engine = Engine(seed=0)
+        engine.game_over = True
+        self.assertIsNone(AIPlayer().choose(engine))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+from game.components.block import Block
+
+
+class TestBlockRotations(unittest.TestCase):
+    def test_rotation_is_an_index_into_precomputed_states(self):
+        """Rotating moves the rotation index and rotating back restores the original shape."""
+        block = Block.from_piece(1)  # T-shape
+        original = block.shape
+        block.rotate()
+        self.assertEqual(block.rotation, 1)
+        self.assertEqual(block.shape, ((0, 1), (1, 1), (0, 1)))
+        block.rotate(-1)
+        self.assertEqual(block.rotation, 0)
+        self.assertEqual(block.shape, original)
+
+    def test_rotation_state_tables(self):
+        """Every rotation state carries consistent cells, row masks and size."""
+        for piece, states in enumerate(Block.ROTATIONS):
+            self.assertEqual(len(states), 4)
+            for state in states:
+                self.assertEqual(len(state.cells), 4)
+                self.assertEqual(len(state.row_masks), state.height)
+                self.assertEqual(len(state.shape[0]), state.width)
+                for x, y in state.cells:
+                    self.assertTrue(state.row_masks[y] & (1 << x))
+        self.assertEqual(Block.UNIQUE_ROTATIONS[4], (0,))
+        self.assertEqual(Block.UNIQUE_ROTATIONS[0], (0, 1))
+        self.assertEqual(Block.UNIQUE_ROTATIONS[1], (0, 1, 2, 3))
+
+    def test_slots_and_shape_lookup(self):
+        """Blocks only hold piece, rotation and position, and legacy (shape, color) construction still works."""
+        block = Block(Block.SHAPES[3], Block.COLORS[3])
+        self.assertEqual((block.piece, block.rotation, block.x, block.y), (3, 0, 3, 0))
+        with self.assertRaises(AttributeError):
+            block.extra = 1
+
+        rotated = Block.from_piece(2, 1)
+        legacy = Block([list(row) for row in rotated.shape], list(rotated.color))
+        self.assertEqual((legacy.piece, legacy.rotation), (2, 1))
+
+    def test_from_dict_accepts_old_and_new_formats(self):
+        """from_dict restores blocks saved with or without piece/rotation fields."""
+        block = Block.from_piece(5, 1, x=4, y=7)
+        self.assertEqual(Block.from_dict(block.to_dict()).to_dict(), block.to_dict())
+
+        old = {'shape': [list(row) for row in block.shape], 'color': list(block.color), 'x': 4, 'y': 7}
+        restored = Block.from_dict(old)
+        self.assertEqual((restored.piece, restored.rotation, restored.x, restored.y), (5, 1, 4, 7))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,201 @@
+import random
+import unittest
+
+import pygame
+
+from game.ai import features
+from game.components.atlas import CellAtlas
+from game.components.block import Block
+from game.components.board import Board
+
+
+class TestBitboard(unittest.TestCase):
+    def setUp(self):
+        self.board = Board()
+
+    def make_block(self, index, x, y):
+        block = Block(Block.SHAPES[index], Block.COLORS[index])
+        block.x, block.y = x, y
+        return block
+
+    def test_place_block_sets_row_masks_and_colours(self):
+        """Placing a block updates both the row bitmasks and the colour grid view."""
+        block = self.make_block(1, 0, 18)  # T-shape at the bottom left
+        self.assertTrue(self.board.is_valid_position(block))
+        self.board.place_block(block)
+
+        self.assertEqual(self.board.rows[18], 0b111)
+        self.assertEqual(self.board.rows[19], 0b010)
+        self.assertEqual(self.board.grid[18][0], Block.COLORS[1])
+        self.assertIsNone(self.board.grid[19][0])
+        self.assertEqual(self.board.grid[19][1], Block.COLORS[1])
+
+    def test_is_valid_position_walls_floor_and_collisions(self):
+        """Collision checks reject walls, the floor and occupied cells but allow rows above the board."""
+        self.assertFalse(self.board.is_valid_position(self.make_block(0, -1, 0)))
+        self.assertFalse(self.board.is_valid_position(self.make_block(0, 7, 0)))
+        self.assertFalse(self.board.is_valid_position(self.make_block(4, 0, 19)))
+        self.assertTrue(self.board.is_valid_position(self.make_block(4, 0, -1)))
+
+        self.board.grid[19][5] = (255, 0, 0)
+        self.assertFalse(self.board.is_valid_position(self.make_block(4, 4, 18)))
+        self.assertTrue(self.board.is_valid_position(self.make_block(4, 6, 18)))
+
+    def test_clear_lines_and_compaction(self):
+        """Full rows are detected and removed, with the rows above shifted down."""
+        for y in (18, 19):
+            for x in range(Board.WIDTH):
+                self.board.grid[y][x] = Block.COLORS[0]
+        self.board.grid[17][3] = Block.COLORS[2]
+
+        self.assertEqual(self.board.clear_lines(), 2)
+        self.assertEqual(self.board.clearing_lines, [19, 18])
+        for _ in range(Board.ANIMATION_STEPS):
+            self.board.update_clearing_animation()
+
+        self.assertTrue(self.board.is_animation_complete())
+        self.assertEqual(self.board.rows[19], 1 << 3)
+        self.assertEqual(self.board.grid[19][3], Block.COLORS[2])
+        self.assertEqual(sum(self.board.rows[:19]), 0)
+
+    def test_grid_assignment_round_trip(self):
+        """Assigning a nested-list grid (e.g. from JSON) registers unknown colours and compares equal."""
+        grid = [[None] * Board.WIDTH for _ in range(Board.HEIGHT)]
+        grid[0][0] = [1, 2, 3]
+        grid[4][9] = (255, 0, 0)
+        self.board.grid = grid
+
+        self.assertEqual(self.board.grid[0][0], (1, 2, 3))
+        self.assertEqual(self.board.rows[4], 1 << 9)
+        expected = [row[:] for row in grid]
+        expected[0][0] = (1, 2, 3)
+        self.assertEqual(self.board.grid, expected)
+        self.assertEqual(self.board.to_grid(), expected)
+
+    def test_draw_changed_redraws_only_changed_cells(self):
+        """After a full draw, only cells whose contents changed are redrawn."""
+        screen = pygame.Surface((Board.WIDTH * Board.CELL_SIZE, Board.HEIGHT * Board.CELL_SIZE))
+        block = self.make_block(4, 0, 0)  # O-shape
+        keys, dirty = self.board.draw_changed(screen, None, block)
+        self.assertEqual(dirty, [screen.get_rect()])
+
+        keys, dirty = self.board.draw_changed(screen, keys, block)
+        self.assertEqual(dirty, [])
+
+        block.y += 1  # The top row is uncovered and a new row is covered
+        keys, dirty = self.board.draw_changed(screen, keys, block)
+        self.assertEqual(sorted((rect.x, rect.y) for rect in dirty),
+                         [(0, 0), (0, 60), (30, 0), (30, 60)])
+        self.assertEqual(screen.get_at((45, 75))[:3], Block.COLORS[4])
+        self.assertEqual(screen.get_at((45, 15))[:3], (0, 0, 0))
+
+        full = pygame.Surface(screen.get_size())
+        self.board.draw(full, block)
+        self.assertEqual(pygame.image.tobytes(full, "RGB"), pygame.image.tobytes(screen, "RGB"))
+
+    def test_draw_changed_redraws_cells_under_areas(self):
+        """Unchanged cells touching an area are redrawn too, along with the changed ones."""
+        screen = pygame.Surface((Board.WIDTH * Board.CELL_SIZE, Board.HEIGHT * Board.CELL_SIZE))
+        block = self.make_block(4, 0, 0)
+        keys, _ = self.board.draw_changed(screen, None, block)
+        screen.fill((255, 255, 255), (90, 300, 60, 30))  # Something drawn over two cells
+        block.y += 1
+        keys, dirty = self.board.draw_changed(screen, keys, block, areas=[pygame.Rect(100, 310, 40, 10)])
+        self.assertEqual(sorted((rect.x, rect.y) for rect in dirty),
+                         [(0, 0), (0, 60), (30, 0), (30, 60), (90, 300), (120, 300)])
+
+        full = pygame.Surface(screen.get_size())
+        self.board.draw(full, block)
+        self.assertEqual(pygame.image.tobytes(full, "RGB"), pygame.image.tobytes(screen, "RGB"))
+
+    def test_drop_distance_matches_probing(self):
+        """The column-mask drop distance equals stepping down until the block collides."""
+        rng = random.Random(4)
+        for _ in range(200):
+            board = Board()
+            for y in range(rng.randrange(4, Board.HEIGHT), Board.HEIGHT):
+                for x in range(Board.WIDTH):
+                    if rng.random() < 0.4:
+                        board.grid[y][x] = Block.COLORS[0]
+            block = self.make_block(rng.randrange(7), 0, rng.randrange(-2, 3))
+            for _ in range(rng.randrange(4)):
+                block.rotate()
+            block.x = rng.randrange(Board.WIDTH - block.rotation_state.width + 1)
+            if not board.is_valid_position(block):
+                continue
+            probe = block.copy()
+            while board.is_valid_position(probe):
+                probe.y += 1
+            self.assertEqual(board.drop_distance(block), probe.y - 1 - block.y)
+            # Column masks stay in step with the rows through clears
+            board.place_block(block)
+            board.remove_lines([y for y in range(Board.HEIGHT) if board.rows[y] == Board.FULL_ROW])
+            columns = [sum(1 << y for y in range(Board.HEIGHT) if board.rows[y] >> x & 1)
+                       for x in range(Board.WIDTH)]
+            self.assertEqual(board.columns, columns)
+
+    def test_stats_follow_placements_and_clears(self):
+        """Row fill, column heights and holes stay equal to a full recount as the board changes."""
+        rng = random.Random(8)
+
+        def check(board):
+            aggregate_height, holes, _, _ = features(board.rows)
+            self.assertEqual(sum(board.heights), aggregate_height)
+            self.assertEqual(board.holes, holes)
+            self.assertEqual(list(board.row_fill), [bin(row).count('1') for row in board.rows])
+
+        for _ in range(30):
+            board = Board()
+            for _ in range(40):
+                block = self.make_block(rng.randrange(7), 0, 0)
+                block.rotate(rng.randrange(4))
+                block.x = rng.randrange(Board.WIDTH - block.rotation_state.width + 1)
+                if not board.is_valid_position(block):
+                    break
+                block.y += board.drop_distance(block)
+                board.place_block(block)
+                if board.clear_lines():
+                    board.finish_clearing_animation()
+                if rng.random() < 0.1:
+                    board.grid[rng.randrange(Board.HEIGHT)][rng.randrange(Board.WIDTH)] = None
+                check(board)
+            restored = Board()
+            restored.load_cells(board.cells, board.palette)
+            check(restored)
+            self.assertEqual(restored.heights, board.heights)
+
+    def test_clear_lines_only_checks_written_rows(self):
+        """Rows that were already full before the last check are not reported again."""
+        for x in range(Board.WIDTH):
+            self.board.grid[19][x] = Block.COLORS[0]
+        self.assertEqual(self.board.clear_lines(), 1)
+        self.board.clearing_lines = []
+        self.assertEqual(self.board.clear_lines(), 0)
+        self.board.place_block(self.make_block(4, 0, 17))
+        self.assertEqual(self.board.clear_lines(), 0)
+
+    def test_ghost_is_cached_until_something_changes(self):
+        """The ghost is reused while the block and board are unchanged."""
+        block = self.make_block(1, 3, 0)
+        ghost = self.board.get_ghost_position(block)
+        self.assertEqual(ghost.y, 18)
+        self.assertIs(self.board.get_ghost_position(block), ghost)
+        self.board.grid[19][4] = Block.COLORS[0]
+        self.assertEqual(self.board.get_ghost_position(block).y, 17)
+        block.x = 6
+        self.assertEqual(self.board.get_ghost_position(block).y, 18)
+
+    def test_atlas_sprites(self):
+        """The atlas holds faded cells for every step and grows for unknown colours."""
+        atlas = CellAtlas(Block.COLORS, Board.CELL_SIZE, Board.ANIMATION_STEPS)
+        surface, area = atlas.fade((255, 0, 0), 5)
+        self.assertEqual(surface.get_at((area.x + 15, area.y + 15))[:3], (127, 0, 0))
+        self.assertEqual(surface.get_at(area.topleft)[:3], (50, 50, 50))
+
+        surface, area = atlas.cell((1, 2, 3))
+        self.assertEqual(surface.get_at((area.x + 15, area.y + 15))[:3], (1, 2, 3))
+        self.assertEqual(atlas.cell((1, 2, 3))[1], area)
+
+
+if __name__ == '__main__':
+    unittest.main()
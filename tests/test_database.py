@@ -0,0 +1,154 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from game.database import SCHEMA_VERSION, TetrisDatabase
+
+
+class TestLeaderboardCache(unittest.TestCase):
+    def setUp(self):
+        handle, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        self.db = TetrisDatabase(self.db_path, leaderboard_size=3)
+
+    def tearDown(self):
+        self.db.close()
+        os.remove(self.db_path)
+
+    def scores(self, limit=10):
+        return [(name, score) for name, score, *_ in self.db.get_high_scores(limit)]
+
+    def test_save_score_updates_the_cache_in_place(self):
+        """New scores are slotted into the cached top N without a reload."""
+        for name, score in (("a", 100), ("b", 300), ("c", 200)):
+            self.db.save_score(name, score, 1, 0)
+        self.assertEqual(self.scores(3), [("b", 300), ("c", 200), ("a", 100)])
+
+        cached = self.db._leaderboard
+        self.db.save_score("d", 250, 1, 0)
+        self.db.save_score("e", 50, 1, 0)
+        self.assertEqual(self.scores(3), [("b", 300), ("d", 250), ("c", 200)])
+        self.assertIs(self.db._leaderboard, cached)
+        self.assertEqual(self.scores(2), [("b", 300), ("d", 250)])
+
+    def test_reloads_after_another_connection_writes(self):
+        """A commit from another connection is picked up through PRAGMA data_version."""
+        self.db.save_score("a", 100, 1, 0)
+        self.assertEqual(self.scores(3), [("a", 100)])
+
+        other = sqlite3.connect(self.db_path)
+        other.execute(
+            "INSERT INTO scores (player_name, score, level, lines_cleared, grade, date_time) "
+            "VALUES ('z', 999, 1, 0, 'F', '2024-01-01 00:00:00')")
+        other.commit()
+        other.close()
+        self.assertEqual(self.scores(3), [("z", 999), ("a", 100)])
+
+    def test_larger_limits_grow_the_cache(self):
+        """Asking for more rows than the cache holds reloads a bigger leaderboard."""
+        for score in range(6):
+            self.db.save_score("p", score, 1, 0)
+        self.assertEqual([score for _, score in self.scores(5)], [5, 4, 3, 2, 1])
+        self.assertEqual(self.db.leaderboard_size, 5)
+
+
+class TestDatabaseWriter(unittest.TestCase):
+    def setUp(self):
+        handle, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        self.db = TetrisDatabase(self.db_path)
+
+    def tearDown(self):
+        self.db.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.db_path + suffix):
+                os.remove(self.db_path + suffix)
+
+    def test_futures_resolve_after_commit(self):
+        """Queued saves are committed in the background and become visible to reads."""
+        futures = [self.db.save_score_async(f"p{i}", i * 10, 1, 0) for i in range(50)]
+        state = self.db.save_game_state_async("p1", '{"score": 1}')
+        self.assertTrue(state.result(timeout=5))
+        self.assertTrue(all(future.result(timeout=5) for future in futures))
+        self.assertEqual(self.db.get_high_scores(1)[0][:2], ("p49", 490))
+        self.assertEqual(self.db.load_game_state("p1"), '{"score": 1}')
+
+    def test_failed_write_does_not_affect_its_batch(self):
+        """A bad statement resolves to False while the rest of the batch commits."""
+        bad = self.db.submit_write("INSERT INTO no_such_table VALUES (?)", (1,))
+        good = self.db.save_score_async("ok", 5, 1, 0)
+        self.assertFalse(bad.result(timeout=5))
+        self.assertTrue(good.result(timeout=5))
+        self.assertEqual(len(self.db.get_player_scores("ok")), 1)
+
+    def test_close_flushes_pending_writes(self):
+        """Closing the database waits for queued writes."""
+        for i in range(20):
+            self.db.save_score_async("late", i, 1, 0)
+        self.db.close()
+        conn = sqlite3.connect(self.db_path)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0], 20)
+        conn.close()
+        self.db = TetrisDatabase(self.db_path)
+
+    def test_inline_writes_reach_the_leaderboard(self):
+        """On an in-memory database, async saves are visible to the next read."""
+        db = TetrisDatabase(":memory:")
+        self.assertEqual(db.get_high_scores(), [])
+        self.assertTrue(db.save_score_async("a", 100, 1, 0).result())
+        self.assertEqual([row[:2] for row in db.get_high_scores()], [("a", 100)])
+        db.save_score("b", 50, 1, 0)
+        self.assertEqual([row[:2] for row in db.get_high_scores()], [("a", 100), ("b", 50)])
+        db.close()
+
+
+class TestSchema(unittest.TestCase):
+    def setUp(self):
+        handle, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+
+    def tearDown(self):
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.db_path + suffix):
+                os.remove(self.db_path + suffix)
+
+    def test_existing_files_are_migrated(self):
+        """A database created before the indexes existed gains them and keeps its rows."""
+        old = sqlite3.connect(self.db_path)
+        old.execute('''
+        CREATE TABLE scores (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            player_name TEXT DEFAULT 'Anonymous',
+            score INTEGER NOT NULL,
+            level INTEGER NOT NULL,
+            lines_cleared INTEGER NOT NULL,
+            grade TEXT NOT NULL,
+            date_time TEXT NOT NULL
+        )
+        ''')
+        old.execute("INSERT INTO scores (player_name, score, level, lines_cleared, grade, date_time) "
+                    "VALUES ('old', 1234, 2, 12, 'D', '2024-01-01 00:00:00')")
+        old.commit()
+        old.close()
+
+        db = TetrisDatabase(self.db_path)
+        try:
+            self.assertEqual(db.schema_version(), SCHEMA_VERSION)
+            self.assertEqual(db.cursor.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            indexes = {row[0] for row in db.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+            self.assertTrue({"idx_scores_score", "idx_scores_player_score"} <= indexes)
+            plan = db.cursor.execute("EXPLAIN QUERY PLAN SELECT * FROM scores ORDER BY score DESC LIMIT 10").fetchall()
+            self.assertIn("idx_scores_score", plan[0][3])
+            self.assertEqual(db.get_player_scores("old")[0][1], 1234)
+        finally:
+            db.close()
+
+        # Opening an up-to-date file again is a no-op
+        db = TetrisDatabase(self.db_path)
+        self.assertEqual(db.schema_version(), SCHEMA_VERSION)
+        db.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
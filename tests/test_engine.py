@@ -0,0 +1,114 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from game.components.board import Board
+from game.database import TetrisDatabase
+from game.engine import Engine, NullSound, TickClock
+
+
+class TestEngine(unittest.TestCase):
+    def test_engine_has_no_side_effect_dependencies(self):
+        """A bare Engine uses a null sound sink, no database and a tick clock."""
+        engine = Engine(seed=0)
+        self.assertIsInstance(engine.sound, NullSound)
+        self.assertIsInstance(engine.clock, TickClock)
+        self.assertIsNone(engine.db)
+        self.assertFalse(engine.save_score())
+        self.assertFalse(engine.save_state())
+        self.assertEqual(engine.get_high_scores(), [])
+
+    def test_seeded_engines_are_reproducible(self):
+        """Two engines with the same seed produce the same piece sequence."""
+        first = Engine(seed=42)
+        second = Engine(seed=42)
+        for _ in range(20):
+            self.assertEqual(first.current_block.piece, second.current_block.piece)
+            first.place(0, 0)
+            second.place(0, 0)
+
+    def test_step_frames_applies_gravity_from_the_tick_clock(self):
+        """Gravity moves the block once fall_speed worth of ticks has elapsed."""
+        engine = Engine(seed=1, clock=TickClock(ms_per_tick=100))
+        start_y = engine.current_block.y
+        engine.step_frames(5)  # 500 ms, not yet past the 0.5 s fall speed
+        self.assertEqual(engine.current_block.y, start_y)
+        engine.step_frames(1)
+        self.assertEqual(engine.current_block.y, start_y + 1)
+
+    def test_line_clear_animation_is_timed_not_counted(self):
+        """The clearing animation lasts the same game time at 60 and 240 updates per second."""
+        for hz in (60, 240):
+            engine = Engine(seed=3, clock=TickClock(ms_per_tick=1000 / hz))
+            for x in range(Board.WIDTH - 4):
+                engine.board.grid[Board.HEIGHT - 1][x] = (255, 0, 0)
+            engine.current_block = engine.current_block.from_piece(0, 0, Board.WIDTH - 4, 0)
+            engine.drop_block()
+            self.assertTrue(engine.clearing_animation)
+            frames = 0
+            while engine.clearing_animation:
+                engine.step_frames(1)
+                frames += 1
+            # Finishes on the first update at or after CLEAR_ANIMATION_MS
+            self.assertLess(abs(frames * 1000 / hz - Board.CLEAR_ANIMATION_MS), 1000 / hz, hz)
+
+    def test_place_clears_lines_and_scores_immediately(self):
+        """A placement that completes a row clears it without waiting for the animation."""
+        engine = Engine(seed=3)
+        for x in range(Board.WIDTH - 4):
+            engine.board.grid[Board.HEIGHT - 1][x] = (255, 0, 0)
+        engine.current_block.piece = 0  # I-shape
+        self.assertEqual(engine.place(0, Board.WIDTH - 4), 1)
+        self.assertFalse(engine.clearing_animation)
+        self.assertEqual(engine.score, 40)
+        self.assertEqual(engine.lines_cleared, 1)
+        self.assertEqual(engine.board.rows[Board.HEIGHT - 1], 0)
+        self.assertEqual(engine.pieces_placed, 1)
+
+    def test_place_rejects_illegal_columns(self):
+        """Placements outside the board are refused and leave the game untouched."""
+        engine = Engine(seed=5)
+        self.assertIsNone(engine.place(0, Board.WIDTH))
+        self.assertEqual(engine.pieces_placed, 0)
+
+    def test_full_game_runs_to_game_over(self):
+        """Repeated placements at the spawn column end the game."""
+        engine = Engine(seed=7)
+        while not engine.game_over:
+            engine.place(0, engine.current_block.x)
+        self.assertTrue(engine.game_over)
+        self.assertIsNone(engine.place(0, 0))
+
+    def test_game_over_queues_the_score(self):
+        """Game over hands the score to the background writer instead of committing inline."""
+        handle, path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        db = TetrisDatabase(path)
+        try:
+            engine = Engine(player_name="over", db=db, seed=7)
+            engine.score = 100
+            with mock.patch.object(db, "save_score", side_effect=AssertionError("blocking save")):
+                while not engine.game_over:
+                    engine.place(0, engine.current_block.x)
+            self.assertTrue(engine.score_saved)
+            self.assertTrue(db.flush(timeout=5))
+            self.assertEqual(db.get_player_scores("over")[0][1], 100)
+        finally:
+            db.close()
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+
+    def test_logic_imports_without_pygame(self):
+        """The engine, board and block can be imported (and run) without loading pygame."""
+        code = ("import sys, game.engine, game.components.board; "
+                "game.engine.Engine(seed=0).drop_block(); print('pygame' in sys.modules)")
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), "False")
+
+
+if __name__ == '__main__':
+    unittest.main()
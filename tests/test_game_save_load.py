@@ -176,6 +176,27 @@ class TestGameSaveLoad(unittest.TestCase):
         self.game.next_block = None
         self.assertFalse(self.game.save_state(), "save_state should fail if next_block is None.")
 
+    def test_save_state_async(self):
+        """Test that a background save resolves to True and can then be loaded."""
+        self.game.score = 4321
+        future = self.game.save_state_async()
+        self.assertTrue(future.result(timeout=5), "Background save should succeed.")
+
+        loaded_game = Game(screen=DUMMY_SCREEN, player_name=self.player_name, db_instance=self.db_instance)
+        self.assertTrue(loaded_game.load_state(), "Failed to load the state saved in the background.")
+        self.assertEqual(loaded_game.score, 4321)
+
+        self.game.current_block = None
+        self.assertFalse(self.game.save_state_async().result(), "save_state_async should fail without a block.")
+
+    def test_restart_drops_leftover_time(self):
+        """A restarted game does not inherit the previous game's accumulated time."""
+        self.game.advance(self.game.timestep.step_ms * 2.5)
+        self.assertGreater(self.game.timestep.accumulator, 0)
+        self.game.restart_game()
+        self.assertEqual(self.game.timestep.accumulator, 0)
+        self.assertFalse(self.game.timestep.behind)
+
 
 if __name__ == '__main__':
     unittest.main()
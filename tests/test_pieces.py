@@ -0,0 +1,59 @@
+import random
+import unittest
+from collections import Counter
+
+from game.components.block import Block
+from game.engine import Engine
+from game.pieces import O, RANDOMIZERS, S, Z, BagSource, HistorySource, UniformSource, make_source
+
+
+class TestPieceSources(unittest.TestCase):
+    def test_uniform_matches_block_random(self):
+        """Chunked uniform pieces are the sequence Block.random draws with the same seed."""
+        rng = random.Random(7)
+        expected = [Block.random(rng).piece for _ in range(1000)]
+        source = UniformSource(7, chunk_size=64)
+        self.assertEqual([source.next() for _ in range(1000)], expected)
+
+    def test_bags_hold_every_piece_once(self):
+        """Each group of seven 7-bag pieces is a permutation of all seven."""
+        source = BagSource(3)
+        pieces = [source.next() for _ in range(7 * 50)]
+        for i in range(0, len(pieces), 7):
+            self.assertEqual(sorted(pieces[i:i + 7]), list(range(7)))
+
+    def test_history_avoids_recent_pieces(self):
+        """The TGM randomizer never starts with S, Z or O and rarely repeats recent pieces."""
+        for seed in range(20):
+            self.assertNotIn(HistorySource(seed).next(), (S, Z, O))
+        source = HistorySource(1)
+        pieces = [source.next() for _ in range(7000)]
+        repeats = sum(a == b for a, b in zip(pieces, pieces[1:]))
+        self.assertLess(repeats, 7000 / 7 / 10)
+        self.assertEqual(set(Counter(pieces)), set(range(7)))
+
+    def test_preview_does_not_consume(self):
+        """preview(n) shows exactly the pieces next() returns, across chunk boundaries."""
+        for name in RANDOMIZERS:
+            source = make_source(name, 5)
+            source.chunk_size = 10
+            upcoming = source.preview(25)
+            self.assertEqual(source.preview(25), upcoming)
+            self.assertEqual([source.next() for _ in range(25)], upcoming)
+        with self.assertRaises(ValueError):
+            make_source("nope")
+
+    def test_engine_preview_queue(self):
+        """Engine.preview starts with next_block and matches the pieces dealt later."""
+        engine = Engine(seed=2, randomizer="7bag")
+        upcoming = engine.preview(5)
+        self.assertEqual(upcoming[0], engine.next_block.piece)
+        dealt = []
+        for _ in range(5):
+            engine.drop_block()
+            dealt.append(engine.current_block.piece)
+        self.assertEqual(dealt, upcoming)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import csv
+import os
+import tempfile
+import unittest
+
+from game.profiler import PHASES, FrameProfiler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestFrameProfiler(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def run_frame(self, profiler, **phase_ms):
+        profiler.begin_frame()
+        for phase, ms in phase_ms.items():
+            self.clock.now += ms / 1000
+            profiler.lap(phase)
+        profiler.end_frame()
+
+    def test_laps_are_charged_to_phases(self):
+        """Each lap charges the time since the previous one; repeated phases add up."""
+        profiler = FrameProfiler(enabled=True, clock=self.clock)
+        profiler.begin_frame()
+        for phase, ms in (('events', 1), ('db', 4), ('events', 2), ('flip', 3)):
+            self.clock.now += ms / 1000
+            profiler.lap(phase)
+        profiler.end_frame()
+        self.assertAlmostEqual(profiler.samples['events'][0], 3)
+        self.assertAlmostEqual(profiler.samples['db'][0], 4)
+        self.assertAlmostEqual(profiler.samples['total'][0], 10)
+        self.assertEqual(profiler.samples['board'][0], 0)
+
+    def test_rolling_percentiles(self):
+        """Percentiles cover only the last window frames."""
+        profiler = FrameProfiler(enabled=True, window=100, clock=self.clock)
+        for ms in range(1, 201):
+            self.run_frame(profiler, update=ms)
+        p50, p95, p99 = profiler.percentiles('update')
+        self.assertAlmostEqual(p50, 150)
+        self.assertAlmostEqual(p95, 195)
+        self.assertAlmostEqual(p99, 199)
+        self.assertEqual(profiler.summary()[-1][0], 'total')
+
+    def test_disabled_records_nothing(self):
+        """A disabled profiler ignores every call."""
+        profiler = FrameProfiler(clock=self.clock)
+        self.run_frame(profiler, update=5, flip=1)
+        self.assertEqual(profiler.frames, 0)
+        self.assertEqual(profiler.percentiles('update'), (0.0, 0.0, 0.0))
+
+    def test_csv_stream(self):
+        """Every profiled frame becomes one CSV row with a column per phase."""
+        handle, path = tempfile.mkstemp(suffix=".csv")
+        os.close(handle)
+        try:
+            profiler = FrameProfiler(enabled=True, csv_path=path, clock=self.clock)
+            self.run_frame(profiler, events=1, board=2)
+            self.run_frame(profiler, hud=0.5)
+            profiler.close()
+            with open(path, newline='') as f:
+                rows = list(csv.DictReader(f))
+        finally:
+            os.remove(path)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(list(rows[0]), ['frame', 'time_ms', *PHASES, 'total'])
+        self.assertEqual(float(rows[0]['board']), 2)
+        self.assertEqual(float(rows[1]['total']), 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import random
+import tempfile
+import unittest
+
+from game import replay
+from game.database import TetrisDatabase
+from game.engine import Engine, TickClock
+from replay import main, simulate
+
+
+def record_game(db=None, seed=5, actions=400):
+    """Play random inputs with gravity on a recording engine."""
+    engine = Engine(player_name="rec", db=db, clock=TickClock(), seed=seed)
+    engine.enable_recording()
+    inputs = random.Random(seed)
+    choices = (replay.LEFT, replay.RIGHT, replay.SOFT_DROP, replay.ROTATE, replay.HARD_DROP)
+    for _ in range(actions):
+        if engine.game_over:
+            break
+        engine.step_frames(inputs.randrange(1, 30))
+        if engine.clearing_animation:
+            engine.board.finish_clearing_animation()
+            engine.finish_line_clear()
+        engine.perform(inputs.choice(choices))
+    return engine
+
+
+class TestReplay(unittest.TestCase):
+    def test_log_round_trip(self):
+        """Events survive encoding, including long gaps and placements."""
+        events = [replay.Event(0, replay.GRAVITY, 0), replay.Event(16, replay.LEFT, 0),
+                  replay.Event(100000, replay.PLACE, replay.place_arg(3, -1)),
+                  replay.Event(100000, replay.HARD_DROP, 0)]
+        data = replay.encode(events)
+        self.assertEqual(len(data), 11)
+        self.assertEqual(replay.decode(data), events)
+        self.assertEqual(replay.unpack_place_arg(events[2].arg), (3, -1))
+        with self.assertRaises(replay.ReplayError):
+            replay.decode(data[:-1])
+
+    def test_replay_reproduces_the_game(self):
+        """Re-simulating the seed and log ends in exactly the recorded state."""
+        engine = record_game()
+        events = replay.decode(replay.encode(engine.recorder.events))
+        self.assertIn(replay.GRAVITY, {event.action for event in events})
+        replayed = Engine.from_replay(engine.seed, events)
+        self.assertEqual(replayed.board.cells, engine.board.cells)
+        self.assertEqual(replayed.current_block.to_dict(), engine.current_block.to_dict())
+        self.assertEqual((replayed.score, replayed.lines_cleared, replayed.game_over),
+                         (engine.score, engine.lines_cleared, engine.game_over))
+
+    def test_ai_placements_are_recorded(self):
+        """place() logs one PLACE action per legal placement."""
+        engine = Engine(seed=9)
+        engine.enable_recording()
+        for x in (0, 4, 8, 3):
+            engine.place(1, x)
+        replayed = Engine.from_replay(9, engine.recorder.events)
+        self.assertEqual(replayed.board.cells, engine.board.cells)
+        self.assertEqual(replayed.pieces_placed, engine.pieces_placed)
+
+    def test_playback_follows_scaled_time(self):
+        """Playback applies the events that are due at speed times the elapsed time."""
+        engine = record_game(actions=50)
+        events = engine.recorder.events
+        playback = replay.Playback(Engine(seed=engine.seed), events, speed=8)
+        halfway = events[len(events) // 2].time_ms
+        applied = playback.advance(halfway / 8)
+        self.assertEqual(applied, sum(1 for event in events if event.time_ms <= halfway))
+        playback.advance(events[-1].time_ms / 8)
+        self.assertTrue(playback.done)
+        self.assertEqual(playback.engine.board.cells, engine.board.cells)
+
+
+class TestReplayStorage(unittest.TestCase):
+    def setUp(self):
+        handle, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        self.db = TetrisDatabase(self.db_path)
+
+    def tearDown(self):
+        self.db.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.db_path + suffix):
+                os.remove(self.db_path + suffix)
+
+    def test_game_over_saves_the_replay(self):
+        """A recorded game is stored when it ends and re-simulates to the same score."""
+        engine = record_game(self.db, actions=10000)
+        self.assertTrue(engine.game_over)
+        (replay_id, name, score, *_), = self.db.get_replays()
+        self.assertEqual((name, score), ("rec", engine.score))
+        _, seed, actions, randomizer = self.db.load_replay(replay_id)
+        replayed, seconds = simulate(seed, replay.decode(actions), randomizer=randomizer)
+        self.assertEqual(replayed.score, engine.score)
+        self.assertTrue(replayed.game_over)
+        self.assertEqual(main(["--db", self.db_path, str(replay_id), "--headless"]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+import json
+import os
+import tempfile
+import unittest
+
+from game import savestate
+from game.ai import AIPlayer
+from game.components.block import Block
+from game.components.board import Board
+from game.database import TetrisDatabase
+from game.engine import Engine
+
+
+class TestSaveState(unittest.TestCase):
+    def make_engine(self):
+        engine = Engine(seed=11)
+        for _ in range(15):
+            engine.place(1, 0)
+            engine.place(0, 5)
+        engine.score, engine.level, engine.lines_cleared = 123456, 7, 61
+        engine.paused = True
+        engine.score_saved = True
+        engine.current_block.y = -1
+        return engine
+
+    def assertRestored(self, engine, state):
+        self.assertEqual(state.cells, engine.board.cells)
+        self.assertEqual(Board().palette[:8], state.palette[:8])
+        for name in ('current_block', 'next_block'):
+            self.assertEqual(getattr(state, name).to_dict(), getattr(engine, name).to_dict())
+        for name in ('score', 'level', 'lines_cleared', 'fall_speed', 'fall_time',
+                     'game_over', 'paused', 'score_saved'):
+            self.assertEqual(getattr(state, name), getattr(engine, name), name)
+
+    def test_round_trip(self):
+        """Every saved field comes back unchanged, with and without zlib."""
+        engine = self.make_engine()
+        for compress in (False, True):
+            data = savestate.encode(engine, compress)
+            self.assertTrue(savestate.is_binary(data))
+            self.assertRestored(engine, savestate.decode(data))
+        self.assertLess(len(savestate.encode(engine)), 200)
+
+    def test_extra_colours_are_kept(self):
+        """Colours outside Block.COLORS (e.g. from old saves) survive, even past 16 palette entries."""
+        engine = Engine(seed=1)
+        for i in range(12):
+            engine.board.set_cell(i % Board.WIDTH, Board.HEIGHT - 1 - i // Board.WIDTH, (i, 2, 3))
+        for i in range(5, 12):
+            engine.board.set_cell(i % Board.WIDTH, Board.HEIGHT - 1 - i // Board.WIDTH, None)
+        self.assertGreater(len(engine.board.palette), 16)  # 5 of the 12 extra colours still in use
+        state = savestate.decode(savestate.encode(engine))
+        self.assertEqual(len(state.palette), 8 + 5)
+        board = Board()
+        board.load_cells(state.cells, state.palette)
+        self.assertEqual(board.to_grid(), engine.board.to_grid())
+        self.assertEqual(board.rows, engine.board.rows)
+
+    def test_delta_round_trip(self):
+        """A delta stores only the changed rows and decodes on top of its keyframe."""
+        engine = self.make_engine()
+        keyframe = savestate.encode(engine)
+        base_cells = bytes(engine.board.cells)
+        engine.place(0, 0)
+        delta = savestate.encode_delta(engine, base_cells)
+        self.assertTrue(savestate.is_delta(delta))
+        self.assertFalse(savestate.is_delta(keyframe))
+        self.assertLess(len(delta), len(keyframe))
+        self.assertRestored(engine, savestate.decode(delta, savestate.decode(keyframe)))
+        with self.assertRaises(savestate.SaveStateError):
+            savestate.decode(delta)
+
+    def test_rejects_bad_data(self):
+        """Truncated, corrupt or future saves raise SaveStateError."""
+        data = savestate.encode(self.make_engine())
+        for bad in (data[:3], data[:-1], b'XX' + data[2:], data[:2] + bytes([99]) + data[3:],
+                    data[:3] + bytes([savestate.FLAG_ZLIB]) + data[4:]):
+            with self.assertRaises(savestate.SaveStateError):
+                savestate.decode(bad)
+
+
+class TestSaveStateStorage(unittest.TestCase):
+    def setUp(self):
+        handle, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        self.db = TetrisDatabase(self.db_path)
+
+    def tearDown(self):
+        self.db.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.db_path + suffix):
+                os.remove(self.db_path + suffix)
+
+    def test_saves_are_blobs(self):
+        """Engine saves go to the database as binary and load back."""
+        engine = Engine(player_name="bin", db=self.db, seed=4)
+        engine.place(0, 0)
+        self.assertTrue(engine.save_state())
+        self.assertIsInstance(self.db.load_game_state("bin"), bytes)
+
+        loaded = Engine(player_name="bin", db=self.db)
+        self.assertTrue(loaded.load_state())
+        self.assertEqual(loaded.board.rows, engine.board.rows)
+        self.assertEqual(loaded.current_block.to_dict(), engine.current_block.to_dict())
+
+    def test_legacy_json_rows_still_load(self):
+        """A JSON save written by the old format loads into the same game."""
+        grid = [[None] * Board.WIDTH for _ in range(Board.HEIGHT)]
+        grid[19][0] = [255, 0, 0]
+        grid[19][1] = [9, 9, 9]
+        legacy = {
+            'board': grid,
+            'current_block': {'shape': Block.SHAPES[1], 'color': list(Block.COLORS[1]), 'x': 4, 'y': 2},
+            'next_block': {'shape': Block.SHAPES[0], 'color': list(Block.COLORS[0]), 'x': 3, 'y': 0},
+            'score': 900, 'level': 2, 'lines_cleared': 12, 'fall_speed': 0.45,
+            'player_name': 'old', 'game_over': False, 'paused': True, 'fall_time': 1000,
+        }
+        self.db.save_game_state("old", json.dumps(legacy))
+
+        engine = Engine(player_name="old", db=self.db)
+        self.assertTrue(engine.load_state())
+        self.assertEqual(engine.board.grid[19][:3], [(255, 0, 0), (9, 9, 9), None])
+        self.assertEqual(engine.board.rows[19], 0b11)
+        self.assertEqual((engine.current_block.piece, engine.current_block.x), (1, 4))
+        self.assertEqual((engine.score, engine.level, engine.paused, engine.score_saved), (900, 2, True, False))
+
+
+class TestAutosave(unittest.TestCase):
+    def setUp(self):
+        handle, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        self.db = TetrisDatabase(self.db_path)
+
+    def tearDown(self):
+        self.db.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.db_path + suffix):
+                os.remove(self.db_path + suffix)
+
+    def test_every_slot_restores_its_placement(self):
+        """Each slot in the ring loads back the state saved after that placement."""
+        engine = Engine(player_name="auto", db=self.db, seed=3)
+        engine.enable_autosave(slots=6, keyframe_interval=3)
+        player = AIPlayer()
+        history = {}
+        for _ in range(20):
+            self.assertIsNotNone(player.play(engine))
+            history[engine.autosaver.sequence - 1] = (bytes(engine.board.cells), engine.score,
+                                                     engine.current_block.to_dict())
+        # Sequences 15..19; 14 was a delta of keyframe 12, deleted when 18 overwrote it
+        autosaves = self.db.get_autosaves("auto")
+        self.assertEqual([row[1] for row in autosaves], [19, 18, 17, 16, 15])
+        self.assertTrue(any(sequence != keyframe for _, sequence, keyframe, _ in autosaves))
+
+        for slot, sequence, _, _ in autosaves:
+            loaded = Engine(player_name="auto", db=self.db)
+            self.assertTrue(loaded.load_state(slot=slot))
+            self.assertEqual((bytes(loaded.board.cells), loaded.score, loaded.current_block.to_dict()),
+                             history[sequence])
+        self.assertFalse(Engine(player_name="nobody", db=self.db).load_state(slot=0))
+
+    def test_overwritten_keyframe_takes_its_deltas(self):
+        """Deltas are deleted with their keyframe instead of being left unloadable."""
+        engine = Engine(player_name="ring", db=self.db, seed=8)
+        engine.enable_autosave(slots=4, keyframe_interval=4)
+        for _ in range(4):
+            engine.drop_block()  # Sequences 0..3: a keyframe and three deltas
+        # A restarted session starts over with a keyframe, so sequence 4 replaces slot 0's keyframe
+        engine.enable_autosave(slots=4, keyframe_interval=4)
+        engine.drop_block()
+        self.assertEqual([row[:3] for row in self.db.get_autosaves("ring")], [(0, 4, 4)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import os
+import unittest
+from unittest import mock
+
+from game.engine import NullSound
+from game.sound import AudioCache, Sound, create_sound, shared_audio
+
+
+class TestAudioCache(unittest.TestCase):
+    def test_null_driver_gives_null_sound(self):
+        """Without an audio device nothing is loaded and games get a NullSound."""
+        cache = AudioCache()
+        with mock.patch.dict(os.environ, {'SDL_AUDIODRIVER': 'dummy'}):
+            self.assertFalse(cache.wait())
+        self.assertEqual(cache.effects, {})
+        self.assertIsInstance(create_sound(cache), NullSound)
+
+    def test_missing_assets_disable_audio(self):
+        """A device but unreadable assets also falls back to no audio."""
+        cache = AudioCache(effects={'rotate': "assets/missing.mp3"})
+        cache.null_drivers = ()
+        with mock.patch.dict(os.environ, {'SDL_AUDIODRIVER': 'dummy'}):
+            self.assertFalse(cache.preload().wait())
+
+    def test_sounds_share_decoded_assets(self):
+        """Every Sound on a cache plays the same decoded effects, loaded once."""
+        cache = AudioCache()
+        cache.null_drivers = ()
+        with mock.patch.dict(os.environ, {'SDL_AUDIODRIVER': 'dummy'}):
+            self.assertTrue(cache.preload().wait())
+        first, second = Sound(cache), create_sound(cache)
+        self.assertIsInstance(second, Sound)
+        self.assertIs(first.drop_sound, second.drop_sound)
+        self.assertIs(shared_audio(), shared_audio())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+import pygame
+
+from game.text_cache import TextCache
+
+pygame.font.init()
+
+
+class TestTextCache(unittest.TestCase):
+    def setUp(self):
+        self.font = pygame.font.Font(None, 24)
+
+    def test_hits_return_the_same_surface(self):
+        """Rendering the same (font, text, colour) twice renders once."""
+        cache = TextCache(maxsize=4)
+        first = cache.render(self.font, "Score: 10", (0, 255, 0))
+        second = cache.render(self.font, "Score: 10", [0, 255, 0])
+        self.assertIs(first, second)
+        self.assertEqual(cache.info(), (1, 1, 4, 1))
+
+        cache.render(self.font, "Score: 10", (255, 255, 255))
+        cache.render(pygame.font.Font(None, 36), "Score: 10", (0, 255, 0))
+        self.assertEqual(cache.info().misses, 3)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """The cache stays bounded and keeps recently used strings."""
+        cache = TextCache(maxsize=2)
+        a = cache.render(self.font, "a", (255, 255, 255))
+        cache.render(self.font, "b", (255, 255, 255))
+        cache.render(self.font, "a", (255, 255, 255))  # "b" is now the oldest
+        cache.render(self.font, "c", (255, 255, 255))
+        self.assertEqual(len(cache), 2)
+        self.assertIs(cache.render(self.font, "a", (255, 255, 255)), a)
+        misses = cache.misses
+        cache.render(self.font, "b", (255, 255, 255))
+        self.assertEqual(cache.misses, misses + 1)
+
+        cache.clear()
+        self.assertEqual(cache.info(), (0, 0, 2, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
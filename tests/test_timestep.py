@@ -0,0 +1,28 @@
+import unittest
+
+from game.timestep import FixedTimestep
+
+
+class TestFixedTimestep(unittest.TestCase):
+    def test_steps_follow_real_time_at_any_frame_rate(self):
+        """30, 60 and 240 FPS frames all simulate 60 steps per second."""
+        for fps in (30, 60, 240):
+            timestep = FixedTimestep(hz=60)
+            steps = sum(timestep.advance(1000 / fps) for _ in range(fps))
+            self.assertIn(steps, (59, 60), fps)
+            self.assertFalse(timestep.behind)
+
+    def test_backlog_is_caught_up_then_dropped(self):
+        """A stall runs at most max_steps per frame, and only max_backlog_ms is made up."""
+        timestep = FixedTimestep(hz=100, max_steps=5, max_backlog_ms=120)
+        self.assertEqual(timestep.advance(1000), 5)  # 1 s stall, capped to a 120 ms backlog
+        self.assertTrue(timestep.behind)
+        self.assertEqual(timestep.advance(0), 5)
+        self.assertEqual(timestep.advance(0), 2)
+        self.assertFalse(timestep.behind)
+        self.assertEqual(timestep.advance(0), 0)
+        self.assertAlmostEqual(timestep.accumulator, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+
+from game.database import TetrisDatabase
+from tournament import parse_agent, play_game, run_tournament, summarize
+
+
+class TestTournament(unittest.TestCase):
+    def setUp(self):
+        handle, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        self.db = TetrisDatabase(self.db_path)
+
+    def tearDown(self):
+        self.db.close()
+        os.remove(self.db_path)
+
+    def test_parse_agent(self):
+        """Agent specs split into AIPlayer options and evaluation weights."""
+        self.assertEqual(parse_agent("default"), ("default", {}))
+        self.assertEqual(parse_agent("fast:lookahead=0,beam=4,holes=-0.5"),
+                         ("fast", {"lookahead": False, "beam": 4, "weights": {"holes": -0.5}}))
+        with self.assertRaises(ValueError):
+            parse_agent("bad:colour=1")
+
+    def test_games_are_reproducible(self):
+        """The same agent and seed always produce the same game."""
+        job = ("default", {"lookahead": False}, 3, 50, "uniform")
+        self.assertEqual(play_game(job)[:6], play_game(job)[:6])
+        bag = ("default", {"lookahead": False}, 3, 50, "7bag")
+        self.assertEqual(play_game(bag)[:6], play_game(bag)[:6])
+
+    def test_results_are_saved_in_bulk(self):
+        """Every game of every agent lands in ai_results under the run id."""
+        agents = {"default": {}, "greedy": {"lookahead": False}}
+        for workers in (1, 2):
+            run_id = f"run{workers}"
+            results = run_tournament(agents, games=3, max_pieces=20, workers=workers,
+                                     db=self.db, run_id=run_id)
+            self.assertEqual(len(results), 6)
+            rows = self.db.get_ai_results(run_id)
+            self.assertEqual(len(rows), 6)
+            self.assertEqual({row[2] for row in rows}, {0, 1, 2})
+            self.assertTrue(all(row[6] == 20 for row in rows))
+
+        summary = summarize(results)
+        self.assertEqual(summary["greedy"]["games"], 3)
+        self.assertLessEqual(summary["greedy"]["min"], summary["greedy"]["median"])
+
+
+if __name__ == '__main__':
+    unittest.main()
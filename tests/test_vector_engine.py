@@ -0,0 +1,75 @@
+import random
+import unittest
+
+import numpy as np
+
+from game.components.block import Block
+from game.components.board import Board
+from game.engine import Engine
+from game.vector_engine import VectorEngine
+
+
+class TestVectorEngine(unittest.TestCase):
+    def test_matches_engine_placements(self):
+        """Each batched board follows the same rules and scoring as a single Engine."""
+        batch = 8
+        engines = [Engine(seed=seed) for seed in range(batch)]
+        vector = VectorEngine(batch, seed=0)
+        choices = random.Random(0)
+
+        # Start with a well in the last column: I pieces go down it and clear
+        # lines, everything else is placed at random in the other columns.
+        well = Board.WIDTH - 1
+        for i, engine in enumerate(engines):
+            for y in range(Board.HEIGHT - 8, Board.HEIGHT):
+                for x in range(well):
+                    engine.board.grid[y][x] = (255, 0, 0)
+            vector.rows[i] = engine.board.rows
+        total_cleared = 0
+
+        for _ in range(300):
+            live = [i for i, engine in enumerate(engines) if not engine.game_over]
+            if not live:
+                break
+            for i, engine in enumerate(engines):
+                vector.pieces[i] = engine.current_block.piece
+                vector.next_pieces[i] = engine.next_block.piece
+            legal = vector.legal_mask()
+            rotations = np.zeros(batch, dtype=np.int64)
+            xs = np.zeros(batch, dtype=np.int64)
+            for i in live:
+                piece = engines[i].current_block.piece
+                if piece == 0 and legal[i, 1, well]:
+                    options = [(1, well)]
+                else:
+                    options = [(r, x) for r, x in zip(*np.nonzero(legal[i]))
+                               if x + Block.ROTATIONS[piece][r].width <= well]
+                if not options:
+                    options = list(zip(*np.nonzero(legal[i])))
+                rotations[i], xs[i] = choices.choice(options)
+            cleared, game_over = vector.step(rotations, xs)
+            total_cleared += cleared.sum()
+            for i in live:
+                engine = engines[i]
+                self.assertEqual(engine.place(int(rotations[i]), int(xs[i])), cleared[i])
+                self.assertEqual(list(vector.rows[i]), engine.board.rows)
+                self.assertEqual(vector.score[i], engine.score)
+                self.assertEqual(vector.level[i], engine.level)
+                self.assertEqual(game_over[i], engine.game_over)
+        self.assertGreater(total_cleared, 0)
+
+    def test_illegal_placement_ends_only_that_board(self):
+        """A placement off the board ends that game and leaves the others running."""
+        vector = VectorEngine(2, seed=1)
+        vector.step([0, 0], [Board.WIDTH, 0])
+        self.assertTrue(vector.game_over[0])
+        self.assertFalse(vector.game_over[1])
+        self.assertEqual(vector.pieces_placed.tolist(), [0, 1])
+
+        vector.reset(vector.game_over)
+        self.assertFalse(vector.game_over.any())
+        self.assertEqual(vector.boards().shape, (2, Board.HEIGHT, Board.WIDTH))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,45 +1,189 @@
+import argparse
+import atexit
 import pygame
 import sys
 import math
+import time
+from game.components.board import Board
 from game.game import Game
 from game.database import TetrisDatabase
-
-# Initialize Pygame
-pygame.init()
+from game.profiler import FrameProfiler
+from game.sound import shared_audio
+from game.text_cache import TextCache
+
+# Rendering is decoupled from the 60 Hz game simulation (see Game.advance)
+parser = argparse.ArgumentParser(description="Play Tetris.")
+parser.add_argument("--fps", type=int, default=120, help="render rate cap, 0 for uncapped (default: 120)")
+parser.add_argument("--vsync", action="store_true", help="sync rendering to the display refresh rate")
+parser.add_argument("--always-render", action="store_true",
+                    help="redraw every frame, even on screens where nothing is changing")
+parser.add_argument("--profile", action="store_true",
+                    help="time each phase of the main loop and show the overlay (F3 toggles it)")
+parser.add_argument("--profile-csv", metavar="PATH", help="stream per-frame phase times to a CSV file")
+args, _ = parser.parse_known_args()
+FPS = args.fps
+MAX_FRAME_SKIP = 4  # Frames in a row that may go unrendered while the simulation catches up
+STATUS_MESSAGE_MS = 2000
+IDLE_WAIT_MS = 50  # Longest sleep on an idle screen, so timers and the menu animation are still seen
+IDLE_REFRESH_MS = 1000  # Idle screens are still redrawn this often, e.g. for leaderboard writes
+PROFILE_REFRESH_MS = 500  # How often the timing overlay's numbers are updated
+
+# Phase timing for the main loop; lap() and end_frame() do nothing while it is disabled
+profiler = FrameProfiler(enabled=args.profile or bool(args.profile_csv), csv_path=args.profile_csv)
+atexit.register(profiler.close)
+show_profile = args.profile
+
+# Initialize only the pygame subsystems the game uses: pygame.init() would
+# also start joysticks and the mixer, and the audio cache opens the mixer
+# itself, in the background, while the menu is up
+pygame.display.init()
+pygame.font.init()
+shared_audio().preload()
+started = time.perf_counter()
+
+def get_ticks():
+    """Milliseconds since startup (pygame.time.get_ticks() stays 0 without pygame.init())."""
+    return int((time.perf_counter() - started) * 1000)
 
 # Set up display
 WIDTH, HEIGHT = 800, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
+try:
+    screen = pygame.display.set_mode((WIDTH, HEIGHT), vsync=int(args.vsync))
+except pygame.error:
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))  # vsync is not available for this renderer
 pygame.display.set_caption("Tetris")
 
-# Set up fonts
+# Show a first frame straight away; the other fonts and the database are
+# loaded behind it
 font = pygame.font.Font(None, 36)
+splash = font.render("Loading...", True, (255, 255, 255))
+screen.fill((0, 0, 0))
+screen.blit(splash, splash.get_rect(center=(WIDTH // 2, HEIGHT // 2)))
+pygame.display.flip()
+pygame.event.pump()
+
+# Set up fonts
 large_font = pygame.font.Font(None, 72)
 small_font = pygame.font.Font(None, 24)
 
 # Menu animation variables
-menu_animation_time = 0
 menu_hover = None
 
+# Rendered text surfaces; most strings are identical from one frame to the next
+text_cache = TextCache(maxsize=256)
+
 def draw_text(text, font, color, x, y):
-    surface = font.render(text, True, color)
+    surface = text_cache.render(font, text, color)
     rect = surface.get_rect(center=(x, y))
     screen.blit(surface, rect)
+    return rect
+
+# What each HUD slot showed on the last PLAYING frame: slot -> (key, rect)
+hud_drawn = {}
+
+def draw_hud_text(slot, text, font, color, x, y, dirty):
+    """Redraw a HUD string only if it changed since the last frame, adding dirty rects."""
+    drawn = hud_drawn.get(slot)
+    if drawn and drawn[0] == (text, color):
+        return
+    if drawn:
+        screen.fill((0, 0, 0), drawn[1])
+        dirty.append(drawn[1])
+        del hud_drawn[slot]
+    if text:
+        rect = draw_text(text, font, color, x, y)
+        dirty.append(rect)
+        hud_drawn[slot] = ((text, color), rect)
+
+def draw_next_preview(dirty):
+    """Redraw the next block preview if the next piece changed."""
+    piece = game.next_block.piece if game.next_block else None
+    drawn = hud_drawn.get("preview")
+    if drawn and drawn[0] == piece:
+        return
+    rect = pygame.Rect(WIDTH - 150, 330, 4 * 30, 2 * 30)
+    screen.fill((0, 0, 0), rect)
+    if game.next_block:
+        for x, y in game.next_block.rotation_state.cells:
+            pygame.draw.rect(
+                screen,
+                game.next_block.color,
+                (WIDTH - 150 + x * 30, 330 + y * 30, 30, 30)
+            )
+    dirty.append(rect)
+    hud_drawn["preview"] = (piece, rect)
+
+def draw_hud(dirty):
+    # Draw score, level, and lines cleared
+    draw_hud_text("score", f"Score: {game.score}", font, (0, 255, 0), WIDTH - 100, 50, dirty)  # Green
+    draw_hud_text("level", f"Level: {game.level}", font, (0, 0, 255), WIDTH - 100, 100, dirty)  # Blue
+    draw_hud_text("lines", f"Lines: {game.lines_cleared}", font, (255, 255, 255), WIDTH - 100, 150, dirty)  # White
+
+    # Draw mute status and game status
+    mute_status = "M: Sound OFF" if is_muted else "M: Sound ON"
+    draw_hud_text("mute", mute_status, font, (255, 255, 255), WIDTH - 100, 200, dirty)
+
+    # Draw game status (P: Pause) - S is now save
+    game_status = "P: Pause" if not game.paused else "P: Resume"
+    draw_hud_text("pause", game_status, font, (255, 255, 255), WIDTH - 100, 230, dirty)
+
+    # Draw save/load instructions
+    draw_hud_text("save", "S: Save", font, (255, 255, 255), WIDTH - 100, HEIGHT - 80, dirty)
+    draw_hud_text("load", "L: Load", font, (255, 255, 255), WIDTH - 100, HEIGHT - 50, dirty)
+
+    # Draw next block preview
+    draw_hud_text("next", "Next:", font, (255, 255, 255), WIDTH - 100, 280, dirty)
+    draw_next_preview(dirty)
+
+    # The status message is drawn over the board, so redraw it whenever cells
+    # under it changed, and restore those cells once it has been erased
+    status = status_message if get_ticks() < status_message_until else ""
+    drawn = hud_drawn.get("status")
+    if drawn and (drawn[0][0] != status or drawn[1].collidelist(dirty) != -1):
+        screen.fill((0, 0, 0), drawn[1])
+        dirty.append(drawn[1])
+        dirty.extend(game.draw_changed(areas=[drawn[1]]))
+        del hud_drawn["status"]
+    draw_hud_text("status", status, font, (255, 255, 0), WIDTH // 2, 30, dirty)  # Yellow, centered top
+
+profile_lines = []
+profile_refresh_at = 0
+
+def draw_profile_overlay(dirty):
+    """Draw (or erase, once hidden) the p50/p95/p99 phase times below the status line."""
+    global profile_lines, profile_refresh_at
+    now = get_ticks()
+    if show_profile and now >= profile_refresh_at:
+        profile_lines = ["ms  p50 / p95 / p99"] + [
+            f"{phase}  {p50:.2f} / {p95:.2f} / {p99:.2f}" for phase, p50, p95, p99 in profiler.summary()]
+        profile_refresh_at = now + PROFILE_REFRESH_MS
+    for i, line in enumerate(profile_lines):
+        draw_hud_text(f"profile{i}", line if show_profile else "", small_font, (255, 255, 0),
+                      (Board.WIDTH * Board.CELL_SIZE + WIDTH - 200) // 2, HEIGHT - 200 + i * 20, dirty)
+
+# Static layers (menu background, translucent panels and overlays), rendered
+# once and only rebuilt when the window size changes: name -> (size, surface)
+layer_cache = {}
+
+def get_layer(name, build):
+    """Return a cached static layer, rebuilding it if the window size changed."""
+    size = screen.get_size()
+    cached = layer_cache.get(name)
+    if cached is None or cached[0] != size:
+        cached = layer_cache[name] = (size, build(*size))
+    return cached[1]
+
+def build_menu_background(width, height):
+    background = pygame.Surface((width, height)).convert()
 
-def draw_menu():
     # Draw gradient background
-    for y in range(HEIGHT):
+    for y in range(height):
         # Create a gradient from dark blue to black
-        color_value = max(0, int(40 * (1 - y / HEIGHT)))
-        pygame.draw.line(screen, (0, color_value, color_value * 2), (0, y), (WIDTH, y))
-
-    # Calculate animation offset based on time
-    global menu_animation_time
-    menu_animation_time = (menu_animation_time + 0.5) % 360
-    offset = int(5 * math.sin(math.radians(menu_animation_time)))
+        color_value = max(0, int(40 * (1 - y / height)))
+        pygame.draw.line(background, (0, color_value, color_value * 2), (0, y), (width, y))
 
     # Draw tetris blocks border around title - moved higher
-    title_rect = pygame.Rect(WIDTH // 2 - 150, HEIGHT // 6 - 30, 300, 120)
+    title_rect = pygame.Rect(width // 2 - 150, height // 6 - 30, 300, 120)
     block_size = 20
 
     # Draw tetromino-like border
@@ -55,10 +199,10 @@ def draw_menu():
             color = (255, 255, 0)  # Yellow
 
         # Top border
-        pygame.draw.rect(screen, color,
+        pygame.draw.rect(background, color,
                         (title_rect.left + i * block_size, title_rect.top, block_size, block_size))
         # Bottom border
-        pygame.draw.rect(screen, color,
+        pygame.draw.rect(background, color,
                         (title_rect.left + i * block_size, title_rect.bottom - block_size, block_size, block_size))
 
     for i in range(title_rect.height // block_size):
@@ -73,11 +217,38 @@ def draw_menu():
             color = (255, 255, 255)  # White
 
         # Left border
-        pygame.draw.rect(screen, color,
+        pygame.draw.rect(background, color,
                         (title_rect.left, title_rect.top + i * block_size, block_size, block_size))
         # Right border
-        pygame.draw.rect(screen, color,
+        pygame.draw.rect(background, color,
                         (title_rect.right - block_size, title_rect.top + i * block_size, block_size, block_size))
+    return background
+
+def build_scores_panel(width, height):
+    # Semi-transparent panel behind the menu's score table
+    scores_panel = pygame.Surface((width - 100, 180))
+    scores_panel.set_alpha(150)
+    scores_panel.fill((0, 0, 50))
+    return scores_panel
+
+def build_overlay(width, height):
+    # Half-transparent black layer for the pause and game over screens
+    overlay = pygame.Surface((width, height))
+    overlay.set_alpha(128)
+    overlay.fill((0, 0, 0))
+    return overlay
+
+def menu_title_offset():
+    """Vertical offset of the bobbing menu title, in whole pixels."""
+    angle = get_ticks() * 0.06 % 360  # 60 degrees per second
+    return int(5 * math.sin(math.radians(angle)))
+
+def draw_menu():
+    # Static gradient and title border
+    screen.blit(get_layer("menu", build_menu_background), (0, 0))
+
+    # Calculate animation offset based on time
+    offset = menu_title_offset()
 
     # Draw title with shadow effect - moved higher
     draw_text("TETRIS", large_font, (30, 30, 30), WIDTH // 2 + 3, HEIGHT // 6 + 3 + offset)  # Shadow
@@ -115,17 +286,16 @@ def draw_menu():
     draw_text(mute_status, font, (255, 255, 255), WIDTH // 2, HEIGHT // 3 + 170 + button_height // 2 - 5)
 
     # Display top scores in a table format
+    profiler.lap('hud')
     high_scores = db.get_high_scores(5)  # Get top 5 for the menu
+    profiler.lap('db')
     if high_scores:
         # Calculate panel position to avoid overlap with buttons
         panel_y = HEIGHT // 3 + 240  # Position after the sound button
         panel_height = 180  # Reduced height
 
         # Draw a semi-transparent panel for scores
-        scores_panel = pygame.Surface((WIDTH - 100, panel_height))
-        scores_panel.set_alpha(150)
-        scores_panel.fill((0, 0, 50))
-        screen.blit(scores_panel, (50, panel_y))
+        screen.blit(get_layer("scores_panel", build_scores_panel), (50, panel_y))
 
         # Draw border for the panel
         pygame.draw.rect(screen, (0, 150, 255), pygame.Rect(50, panel_y, WIDTH - 100, panel_height), 2)
@@ -159,10 +329,7 @@ def draw_menu():
     draw_text("v1.0.0", small_font, (100, 100, 100), WIDTH - 40, HEIGHT - 20)
 
 def draw_game_over():
-    overlay = pygame.Surface((WIDTH, HEIGHT))
-    overlay.set_alpha(128)
-    overlay.fill((0, 0, 0))
-    screen.blit(overlay, (0, 0))
+    screen.blit(get_layer("overlay", build_overlay), (0, 0))
     draw_text("GAME OVER", large_font, (255, 0, 0), WIDTH // 2, 80)  # Red
     draw_text(f"Score: {game.score}", font, (0, 255, 0), WIDTH // 2, 140)  # Green
     draw_text(f"Level: {game.level}", font, (0, 255, 0), WIDTH // 2, 180)  # Green
@@ -174,7 +341,9 @@ def draw_game_over():
 
     # Display top 10 scores
     draw_text("TOP SCORES", font, (255, 215, 0), WIDTH // 2, 270)  # Gold
+    profiler.lap('hud')
     high_scores = db.get_high_scores(10)
+    profiler.lap('db')
     if not high_scores:
         draw_text("No scores yet!", font, (255, 255, 255), WIDTH // 2, 310)
     else:
@@ -197,10 +366,7 @@ def draw_game_over():
     draw_text("Press Q to quit", font, (255, 255, 0), WIDTH // 2, HEIGHT - 20)  # Yellow
 
 def draw_pause():
-    overlay = pygame.Surface((WIDTH, HEIGHT))
-    overlay.set_alpha(128)
-    overlay.fill((0, 0, 0))
-    screen.blit(overlay, (0, 0))
+    screen.blit(get_layer("overlay", build_overlay), (0, 0))
     draw_text("PAUSED", large_font, (255, 255, 255), WIDTH // 2, HEIGHT // 2)
     draw_text("Press P or S to resume", font, (255, 255, 255), WIDTH // 2, HEIGHT // 2 + 50)
 
@@ -218,7 +384,7 @@ input_active = False
 
 # Scrolling scores variables
 scroll_positions = []
-scroll_speed = 1.5  # pixels per frame
+scroll_speed = 180  # pixels per second
 scroll_paused = False
 
 # Sound state
@@ -226,8 +392,10 @@ is_muted = False
 
 # Status message variables
 status_message = ""
-status_message_timer = 0
-FPS = 120 # Define FPS for timer
+status_message_until = 0  # get_ticks() when the message disappears
+
+# Future of a game state save still being written by the database writer
+pending_save = None
 
 def draw_high_scores():
     screen.fill((0, 0, 0))
@@ -237,7 +405,9 @@ def draw_high_scores():
     mute_status = "Sound: OFF (M)" if is_muted else "Sound: ON (M)"
     draw_text(mute_status, font, (255, 255, 255), WIDTH - 100, 20)
 
+    profiler.lap('hud')
     high_scores = db.get_high_scores(10)
+    profiler.lap('db')
     if not high_scores:
         draw_text("No scores yet!", font, (255, 255, 255), WIDTH // 2, HEIGHT // 2)
     else:
@@ -267,7 +437,7 @@ def draw_name_input():
     pygame.draw.rect(screen, color, input_box, 2)
 
     # Render the input text
-    text_surface = font.render(input_text, True, (255, 255, 255))
+    text_surface = text_cache.render(font, input_text, (255, 255, 255))
     screen.blit(text_surface, (input_box.x + 5, input_box.y + 5))
 
     draw_text("Press ENTER to save", font, (255, 255, 255), WIDTH // 2, HEIGHT // 2 + 100)
@@ -288,7 +458,7 @@ def draw_start_name_input():
     pygame.draw.rect(screen, color, input_box, 2)
 
     # Render the input text
-    text_surface = font.render(input_text, True, (255, 255, 255))
+    text_surface = text_cache.render(font, input_text, (255, 255, 255))
     screen.blit(text_surface, (input_box.x + 5, input_box.y + 5))
 
     draw_text("Press ENTER to start game", font, (255, 255, 255), WIDTH // 2, HEIGHT // 2 + 80)
@@ -302,7 +472,9 @@ def draw_scrolling_scores():
     mute_status = "Sound: OFF (M)" if is_muted else "Sound: ON (M)"
     draw_text(mute_status, font, (255, 255, 255), WIDTH - 100, 20)
 
+    profiler.lap('hud')
     high_scores = db.get_high_scores(10)
+    profiler.lap('db')
     if not high_scores:
         draw_text("No scores yet!", font, (255, 255, 255), WIDTH // 2, HEIGHT // 2)
         draw_text("Press any key to go back", font, (255, 255, 255), WIDTH // 2, HEIGHT - 50)
@@ -327,7 +499,7 @@ def draw_scrolling_scores():
     # Update scroll positions if not paused
     if not scroll_paused:
         for i in range(len(scroll_positions)):
-            scroll_positions[i] -= scroll_speed
+            scroll_positions[i] -= scroll_speed * frame_ms / 1000
             # If a score scrolls off the top, move it to the bottom
             if scroll_positions[i] < scroll_area_top - 60:
                 scroll_positions[i] = scroll_area_bottom
@@ -356,16 +528,46 @@ SCROLLING_SCORES = 6
 
 state = MENU
 game_over_time = 0
+full_redraw = True  # Redraw the whole window on the next PLAYING frame
+frame_ms = 0  # Real time the previous frame took
+frames_skipped = 0  # PLAYING frames skipped in a row to let the simulation catch up
 score_saved = False
 
+# Screens that only change on input, a timer or the menu title moving a pixel
+# are redrawn only when one of those marks them dirty; in between, the loop
+# sleeps in pygame.event.wait instead of redrawing the same frame.
+screen_dirty = True
+drawn_state = None
+drawn_menu_offset = None
+last_render = 0
+
+def idle_screen():
+    """True if nothing on the current screen changes without input."""
+    if args.always_render:
+        return False
+    return state in (MENU, GAME_OVER, HIGH_SCORES, NAME_INPUT, START_NAME_INPUT) or (
+        state == PLAYING and game.paused)
+
 # Main game loop
 clock = pygame.time.Clock()
 while True:
-    for event in pygame.event.get():
+    if idle_screen() and not screen_dirty:
+        event = pygame.event.wait(IDLE_WAIT_MS)
+        events = [event] + pygame.event.get() if event.type != pygame.NOEVENT else []
+    else:
+        events = pygame.event.get()
+    profiler.begin_frame()
+
+    for event in events:
         if event.type == pygame.QUIT:
             pygame.quit()
             sys.exit()
 
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            show_profile = not show_profile
+            profiler.enabled = show_profile or bool(args.profile_csv)
+            continue
+
         if state == MENU:
             # Handle mouse hover for buttons
             if event.type == pygame.MOUSEMOTION:
@@ -416,20 +618,29 @@ while True:
                     is_muted = game.toggle_mute()
                 elif event.key == pygame.K_s: # Save game state
                     if game:
-                        if game.save_state():
-                            status_message = "Game saved!"
-                            status_message_timer = FPS * 2 # Display for 2 seconds
-                        else:
-                            status_message = "Error saving game."
-                            status_message_timer = FPS * 2
+                        # Written in the background; the message is shown once it has committed
+                        pending_save = game.save_state_async()
                 elif event.key == pygame.K_l: # Load game state
                     if game:
-                        if game.load_state():
+                        profiler.lap('events')
+                        loaded = game.load_state()
+                        profiler.lap('db')
+                        if loaded:
                             status_message = "Game loaded!"
-                            status_message_timer = FPS * 2
                         else:
                             status_message = "No saved game found or error loading."
-                            status_message_timer = FPS * 2
+                        status_message_until = get_ticks() + STATUS_MESSAGE_MS
+                elif event.key == pygame.K_a: # Load the latest autosave
+                    if game:
+                        profiler.lap('events')
+                        autosaves = game.db.get_autosaves(game.autosaver.player_name)
+                        loaded = bool(autosaves) and game.load_state(slot=autosaves[0][0])
+                        profiler.lap('db')
+                        if loaded:
+                            status_message = "Autosave loaded!"
+                        else:
+                            status_message = "No autosave found or error loading."
+                        status_message_until = get_ticks() + STATUS_MESSAGE_MS
                 elif event.key == pygame.K_p: # Existing Pause functionality
                     game.toggle_pause()
                 elif event.key == pygame.K_q:
@@ -440,10 +651,10 @@ while True:
             if game and not game.clearing_animation:
                 game.handle_event(event)
         elif state == GAME_OVER:
-            if pygame.time.get_ticks() - game_over_time > 1000:  # 1 second delay
+            if get_ticks() - game_over_time > 1000:  # 1 second delay
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_r:
-                        game = Game(screen, game.player_name)
+                        game = Game(screen, game.player_name, db_instance=db)
                         # Apply mute state to new game
                         if is_muted:
                             game.toggle_mute()
@@ -479,7 +690,7 @@ while True:
                 if event.key == pygame.K_RETURN:
                     if input_text.strip():
                         game.set_player_name(input_text.strip())
-                    game.save_score()
+                    game.save_score_async()
                     score_saved = True
                     state = GAME_OVER
                 elif event.key == pygame.K_BACKSPACE:
@@ -500,7 +711,7 @@ while True:
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_RETURN:
                     player_name = input_text.strip() if input_text.strip() else "Anonymous"
-                    game = Game(screen, player_name)
+                    game = Game(screen, player_name, db_instance=db)
                     # Apply mute state if it was set before game started
                     if is_muted:
                         game.toggle_mute()
@@ -529,60 +740,67 @@ while True:
                 else:
                     state = MENU
 
-    screen.fill((0, 0, 0))  # Black background
+    profiler.lap('events')
+    now = get_ticks()
+    if events or state != drawn_state or now - last_render >= IDLE_REFRESH_MS or (
+            state == MENU and menu_title_offset() != drawn_menu_offset):
+        screen_dirty = True
+    if idle_screen() and not screen_dirty:
+        frame_ms = clock.tick(FPS)
+        continue
+    screen_dirty = False
+    drawn_state = state
+    drawn_menu_offset = menu_title_offset()
+    last_render = now
+
+    # While playing, only the cells and HUD items that changed are redrawn and
+    # pushed to the display; every other screen is redrawn in full.
+    dirty_rects = None
+    if state not in (PLAYING, MENU):  # The menu background covers the whole window
+        screen.fill((0, 0, 0))  # Black background
 
     if state == MENU:
         draw_menu()
     elif state == PLAYING:
-        game.update()
-        game.draw()
-
-        # Draw score, level, and lines cleared
-        draw_text(f"Score: {game.score}", font, (0, 255, 0), WIDTH - 100, 50)  # Green
-        draw_text(f"Level: {game.level}", font, (0, 0, 255), WIDTH - 100, 100)  # Blue
-        draw_text(f"Lines: {game.lines_cleared}", font, (255, 255, 255), WIDTH - 100, 150)  # White
-
-        # Draw mute status and game status
-        mute_status = "M: Sound OFF" if is_muted else "M: Sound ON"
-        draw_text(mute_status, font, (255, 255, 255), WIDTH - 100, 200)
-
-        # Draw game status (P: Pause) - S is now save
-        game_status = "P: Pause" if not game.paused else "P: Resume"
-        draw_text(game_status, font, (255, 255, 255), WIDTH - 100, 230)
-
-        # Draw save/load instructions
-        draw_text("S: Save", font, (255, 255, 255), WIDTH - 100, HEIGHT - 80)
-        draw_text("L: Load", font, (255, 255, 255), WIDTH - 100, HEIGHT - 50)
-
-        # Draw next block preview
-        draw_text("Next:", font, (255, 255, 255), WIDTH - 100, 280)
-        if game.next_block:
-            for y, row in enumerate(game.next_block.shape):
-                for x, cell in enumerate(row):
-                    if cell:
-                        pygame.draw.rect(
-                            screen,
-                            game.next_block.color,
-                            (WIDTH - 150 + x * 30, 330 + y * 30, 30, 30)
-                        )
-        
-        # Display status message
-        if status_message_timer > 0:
-            draw_text(status_message, font, (255, 255, 0), WIDTH // 2, 30) # Yellow, centered top
-            status_message_timer -= 1
+        # Run the fixed 60 Hz simulation steps for the time the last frame took
+        game.advance(frame_ms)
+
+        if pending_save is not None and pending_save.done():
+            status_message = "Game saved!" if pending_save.result() else "Error saving game."
+            status_message_until = get_ticks() + STATUS_MESSAGE_MS
+            pending_save = None
+        profiler.lap('update')
+
+        # While the simulation is catching up, skip a few frames instead of rendering them
+        if game.timestep.behind and frames_skipped < MAX_FRAME_SKIP and not full_redraw:
+            frames_skipped += 1
+            dirty_rects = []
         else:
+            frames_skipped = 0
+            if full_redraw or game.paused:
+                screen.fill((0, 0, 0))
+                game.invalidate_drawing()
+                hud_drawn.clear()
+            dirty_rects = game.draw_changed()
+            profiler.lap('board')
+            draw_hud(dirty_rects)
+            if show_profile or "profile0" in hud_drawn:
+                draw_profile_overlay(dirty_rects)
+
+            if game.paused:
+                draw_pause()
+                dirty_rects = None
+
+        if get_ticks() >= status_message_until:
             status_message = ""
 
-
-        if game.paused:
-            draw_pause()
-
         if game.game_over:
-            game_over_time = pygame.time.get_ticks()
+            game_over_time = get_ticks()
             state = GAME_OVER
 
     elif state == GAME_OVER:
         game.draw()
+        profiler.lap('board')
         draw_game_over()
 
     elif state == HIGH_SCORES:
@@ -597,5 +815,13 @@ while True:
     elif state == SCROLLING_SCORES:
         draw_scrolling_scores()
 
-    pygame.display.flip()
-    clock.tick(120)  # 120 FPS for smoother animation
+    profiler.lap('hud')
+
+    if dirty_rects is None:
+        pygame.display.flip()
+    elif dirty_rects:
+        pygame.display.update(dirty_rects)
+    full_redraw = dirty_rects is None
+    profiler.lap('flip')
+    profiler.end_frame()
+    frame_ms = clock.tick(FPS)  # FPS 0 means uncapped
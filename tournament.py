@@ -0,0 +1,180 @@
+"""Run seeded headless games of one or more AI agents and compare them.
+
+Example:
+    python tournament.py --games 1000 --agent default --agent greedy:lookahead=0 \\
+        --agent holes:holes=-0.6
+
+Every agent plays the same seeds, games are spread over a process pool and the
+results are written in bulk to the ai_results table of the score database.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from game.ai import AIPlayer, DEFAULT_WEIGHTS
+from game.database import TetrisDatabase
+from game.engine import Engine
+from game.pieces import RANDOMIZERS
+
+# Results are written to the database in batches of this many games
+WRITE_BATCH = 500
+
+
+def parse_agent(spec):
+    """Parse NAME[:key=value,...] into (name, options).
+
+    Keys are AIPlayer options (lookahead, beam) or evaluation weights
+    (see game.ai.DEFAULT_WEIGHTS).
+    """
+    name, _, settings = spec.partition(":")
+    options = {}
+    weights = {}
+    for setting in filter(None, settings.split(",")):
+        key, sep, value = setting.partition("=")
+        if not sep:
+            raise ValueError(f"Expected key=value in agent '{spec}', got '{setting}'")
+        if key == "lookahead":
+            options[key] = value.lower() not in ("0", "false", "no", "off")
+        elif key == "beam":
+            options[key] = int(value) if value.lower() != "none" else None
+        elif key in DEFAULT_WEIGHTS:
+            weights[key] = float(value)
+        else:
+            raise ValueError(f"Unknown setting '{key}' in agent '{spec}'")
+    if weights:
+        options["weights"] = weights
+    return name or "default", options
+
+
+def play_game(job):
+    """Play one headless game; returns (agent, seed, score, level, lines, pieces, seconds)."""
+    agent, options, seed, max_pieces, randomizer = job
+    engine = Engine(player_name=agent, seed=seed, randomizer=randomizer)
+    player = AIPlayer(**options)
+    start = time.perf_counter()
+    while not engine.game_over and engine.pieces_placed < max_pieces:
+        if player.play(engine) is None:
+            break
+    return (agent, seed, engine.score, engine.level, engine.lines_cleared,
+            engine.pieces_placed, time.perf_counter() - start)
+
+
+def run_tournament(agents, games, seed=0, max_pieces=1000, workers=None, db=None, run_id=None,
+                   randomizer="uniform"):
+    """Play games seeds per agent and return the list of play_game results.
+
+    agents maps a name to AIPlayer options; pieces are dealt by the named
+    randomizer (see game.pieces.RANDOMIZERS). With db, results are saved under
+    run_id as they arrive, WRITE_BATCH games per transaction. workers=1 plays
+    in this process instead of starting a pool.
+    """
+    jobs = [(agent, options, seed + game, max_pieces, randomizer)
+            for game in range(games)
+            for agent, options in agents.items()]
+    configs = {agent: json.dumps(dict(options, randomizer=randomizer), sort_keys=True)
+               for agent, options in agents.items()}
+    results = []
+    pending = []
+
+    def collect(result):
+        results.append(result)
+        if db is not None:
+            agent, game_seed, score, level, lines, pieces, seconds = result
+            pending.append((run_id, agent, configs[agent], game_seed, score, level, lines, pieces, seconds))
+            if len(pending) >= WRITE_BATCH:
+                db.save_ai_results(pending)
+                pending.clear()
+
+    if workers == 1:
+        for job in jobs:
+            collect(play_game(job))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 8))
+            for result in executor.map(play_game, jobs, chunksize=chunksize):
+                collect(result)
+    if db is not None and pending:
+        db.save_ai_results(pending)
+    return results
+
+
+def summarize(results):
+    """Per-agent score distribution: {agent: {games, mean, stdev, min, p25, median, p75, max, lines, pieces}}."""
+    by_agent = {}
+    for agent, _, score, _, lines, pieces, _ in results:
+        by_agent.setdefault(agent, []).append((score, lines, pieces))
+    summary = {}
+    for agent, games in by_agent.items():
+        scores = sorted(score for score, _, _ in games)
+        quartiles = statistics.quantiles(scores, n=4) if len(scores) > 1 else scores * 3
+        summary[agent] = {
+            "games": len(games),
+            "mean": statistics.fmean(scores),
+            "stdev": statistics.pstdev(scores),
+            "min": scores[0],
+            "p25": quartiles[0],
+            "median": quartiles[1],
+            "p75": quartiles[2],
+            "max": scores[-1],
+            "lines": statistics.fmean(lines for _, lines, _ in games),
+            "pieces": statistics.fmean(pieces for _, _, pieces in games),
+        }
+    return summary
+
+
+def print_report(results, elapsed):
+    games = len(results)
+    pieces = sum(result[5] for result in results)
+    print(f"{games} games, {pieces} pieces in {elapsed:.2f}s: "
+          f"{games / elapsed:.1f} games/sec, {pieces / elapsed:.0f} pieces/sec")
+    print(f"{'agent':<16}{'games':>7}{'mean':>10}{'stdev':>10}{'min':>8}{'p25':>9}"
+          f"{'median':>9}{'p75':>9}{'max':>8}{'lines':>8}{'pieces':>8}")
+    for agent, stats in summarize(results).items():
+        print(f"{agent:<16}{stats['games']:>7}{stats['mean']:>10.1f}{stats['stdev']:>10.1f}"
+              f"{stats['min']:>8}{stats['p25']:>9.0f}{stats['median']:>9.0f}{stats['p75']:>9.0f}"
+              f"{stats['max']:>8}{stats['lines']:>8.1f}{stats['pieces']:>8.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare AI agents over seeded headless Tetris games.")
+    parser.add_argument("--agent", action="append", dest="agents", metavar="NAME[:key=value,...]",
+                        help="agent to enter (repeatable); keys are lookahead, beam or a weight name")
+    parser.add_argument("--games", type=int, default=100, help="games per agent (default: 100)")
+    parser.add_argument("--seed", type=int, default=0, help="first seed; game i uses seed + i")
+    parser.add_argument("--max-pieces", type=int, default=1000, help="stop a game after this many pieces")
+    parser.add_argument("--randomizer", choices=sorted(RANDOMIZERS), default="uniform",
+                        help="piece randomizer (default: uniform)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: every core)")
+    parser.add_argument("--db", default="tetris_scores.db", help="score database to write results to")
+    parser.add_argument("--no-save", action="store_true", help="don't write results to the database")
+    args = parser.parse_args(argv)
+
+    agents = {}
+    try:
+        for spec in args.agents or ["default"]:
+            name, options = parse_agent(spec)
+            agents[name] = options
+    except ValueError as e:
+        parser.error(str(e))
+
+    db = None if args.no_save else TetrisDatabase(args.db)
+    run_id = uuid.uuid4().hex[:12]
+    start = time.perf_counter()
+    results = run_tournament(agents, args.games, seed=args.seed, max_pieces=args.max_pieces,
+                             workers=args.workers, db=db, run_id=run_id, randomizer=args.randomizer)
+    print_report(results, time.perf_counter() - start)
+    if db is not None:
+        print(f"Results saved to {args.db} as run {run_id}")
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())